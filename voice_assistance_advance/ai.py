@@ -2,12 +2,17 @@ import os
 import queue
 import threading
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 import sounddevice as sd
+import ctranslate2
 from faster_whisper import WhisperModel
 from piper import PiperVoice
 import pyjokes
+import ahocorasick
 import datetime
+import functools
 import logging
+import math
 from typing import Optional, Callable, List
 import time
 import yaml
@@ -21,15 +26,30 @@ except ImportError:
     GOOGLE_STT_AVAILABLE = False
     speech_v1 = None
 
+# Numba (optional - audio kernels fall back to NumPy if unavailable)
+try:
+    import numba
+
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    numba = None
+
+# Precompiled audio kernels (optional - build with `python compile_kernels.py`)
+try:
+    import audio_kernels
+
+    AOT_KERNELS_AVAILABLE = True
+except ImportError:
+    AOT_KERNELS_AVAILABLE = False
+    audio_kernels = None
+
+import dsp_kernels
+from log_setup import setup_logging
+
 # --- Logging Setup ---
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('voice_assistant.log'),
-        logging.StreamHandler()
-    ]
-)
+# Same off-thread layout as main.py; whichever is imported first installs it
+setup_logging()
 logger = logging.getLogger(__name__)
 
 
@@ -45,7 +65,10 @@ def load_config(config_file='config.yaml'):
         'whisper': {
             'model_dir': 'whisper_model',
             'device': 'cpu',
-            'compute_type': 'int8',
+            'wake_model_dir': 'whisper_model_tiny',
+            'compute_type': 'auto',
+            'cpu_threads': 0,
+            'num_workers': 1,
             'vad': {
                 'enabled': True,
                 'threshold': 0.45,
@@ -73,11 +96,15 @@ def load_config(config_file='config.yaml'):
         'audio': {
             'sample_rate': 16000,
             'chunk_duration_seconds': 3,
-            'blocksize': 4096,
+            'blocksize': 1024,
+            'latency': 'low',
             'channels': 1,
             'rms_threshold': 0.015,
             'peak_threshold': 0.04,
-            'noise_gate_threshold': 0.01
+            'noise_gate_threshold': 0.01,
+            'zcr_threshold': 0.02,
+            'window_seconds': 1.0,
+            'hop_seconds': 0.25
         },
         'logging': {
             'level': 'INFO',
@@ -128,6 +155,93 @@ WHISPER_MODEL_DIR = os.path.join(os.path.dirname(__file__), CONFIG['whisper']['m
 WAKE_WORD = CONFIG['wake_word']['phrase']
 WAKE_WORD_TIMEOUT = CONFIG['wake_word']['timeout']
 
+# Capture slots between the audio callback and the listen loop
+AUDIO_RING_SLOTS = 32
+AUDIO_VARIABLE_BLOCK_FRAMES = 4096  # slot length when blocksize is 0 (host picks, may vary)
+
+# Fastest CTranslate2 compute types first; int8 is the safe baseline
+COMPUTE_TYPE_PREFERENCE = {
+    'cpu': ('int8_float16', 'int8', 'int8_float32', 'float32'),
+    'cuda': ('int8_float16', 'float16', 'int8', 'float32'),
+}
+
+
+def select_compute_type(device: str, requested: str = 'auto') -> str:
+    """Pick the fastest compute type CTranslate2 supports on this device."""
+    try:
+        supported = ctranslate2.get_supported_compute_types(device)
+    except Exception as e:
+        logger.warning(f"Could not query compute types for '{device}': {e}, using int8")
+        return 'int8'
+
+    if requested != 'auto':
+        if requested in supported:
+            return requested
+        logger.warning(f"Compute type '{requested}' not supported on {device}, selecting automatically")
+
+    for compute_type in COMPUTE_TYPE_PREFERENCE.get(device, ('int8',)):
+        if compute_type in supported:
+            return compute_type
+    return 'int8'
+
+
+@functools.lru_cache(maxsize=None)
+def _cached_whisper_model(model_dir: str, device: str, compute_type: str,
+                          cpu_threads: int, num_workers: int) -> WhisperModel:
+    """Load a Whisper model once per process; later assistants reuse the loaded weights."""
+    logger.info(f"Loading Whisper model from: {model_dir}")
+    model = WhisperModel(
+        model_dir,
+        device=device,
+        compute_type=compute_type,
+        cpu_threads=cpu_threads,
+        num_workers=num_workers
+    )
+    logger.info(f"Whisper model loaded successfully ({compute_type}, {cpu_threads} threads)")
+    return model
+
+
+# --- Audio Kernels ---
+# Prefer the AOT-built extension, then Numba JIT, then plain NumPy
+if AOT_KERNELS_AVAILABLE:
+    _audio_stats = audio_kernels.audio_stats
+    _noise_gate = audio_kernels.noise_gate
+elif NUMBA_AVAILABLE:
+    _audio_stats = numba.njit(cache=True, fastmath=True, boundscheck=False)(dsp_kernels.audio_stats)
+    _noise_gate = numba.njit(parallel=True, fastmath=True, cache=True)(dsp_kernels.noise_gate)
+
+    # Warm the JIT cache so the first real chunk doesn't pay compile cost
+    _audio_stats(np.zeros(1, dtype=np.float32))
+    _noise_gate(np.zeros(1, dtype=np.float32), 0.0, np.empty(1, dtype=np.float32))
+else:
+    def _audio_stats(audio):
+        """Compute (rms, peak, zero-crossing rate) of a float32 buffer (NumPy fallback)."""
+        # np.dot and min/max reduce without allocating audio**2 or abs(audio)
+        n = audio.shape[0]
+        rms = math.sqrt(float(np.dot(audio, audio)) / n)
+        peak = max(-float(audio.min()), float(audio.max()))
+        neg = audio < 0
+        zcr = np.count_nonzero(neg[1:] != neg[:-1]) / len(audio)
+        return rms, peak, zcr
+
+    def _noise_gate(audio, threshold, out):
+        """Zero samples at or below threshold, writing into out (NumPy fallback)."""
+        np.multiply(audio, np.abs(audio) > threshold, out=out)
+
+
+# Per-window stats run every hop; only the JIT has a multi-window kernel
+if NUMBA_AVAILABLE:
+    _window_stats = numba.njit(parallel=True, fastmath=True, cache=True)(dsp_kernels.window_stats)
+    _window_stats(sliding_window_view(np.zeros(2, dtype=np.float32), 1), np.empty((2, 3)))
+else:
+    def _window_stats(windows, out):
+        """Compute (rms, peak, zero-crossing rate) per window row into out (NumPy fallback)."""
+        n = windows.shape[1]
+        out[:, 0] = np.sqrt(np.einsum('ij,ij->i', windows, windows) / n)
+        out[:, 1] = np.maximum(-windows.min(axis=1), windows.max(axis=1))
+        neg = windows < 0
+        out[:, 2] = np.count_nonzero(neg[:, 1:] != neg[:, :-1], axis=1) / n
+
 
 # --- Utility Audio Filters ---
 def is_significant_audio(audio, rms_threshold=None, peak_threshold=None):
@@ -139,17 +253,23 @@ def is_significant_audio(audio, rms_threshold=None, peak_threshold=None):
 
     if len(audio) == 0:
         return False
-    rms = np.sqrt(np.mean(audio ** 2))
-    peak = np.max(np.abs(audio))
+    rms, peak, _ = _audio_stats(np.ascontiguousarray(audio, dtype=np.float32))
     return rms > rms_threshold or peak > peak_threshold
 
 
-def noise_gate(audio, threshold=None):
-    """Simple noise gate to mute low-level sounds."""
+def noise_gate(audio, threshold=None, out=None):
+    """Simple noise gate to mute low-level sounds.
+
+    If out is given it must match audio's length; the gated signal is
+    written into it and returned, avoiding a per-chunk allocation.
+    """
     if threshold is None:
         threshold = CONFIG['audio']['noise_gate_threshold']
-    mask = np.abs(audio) > threshold
-    return audio * mask
+    audio = np.ascontiguousarray(audio, dtype=np.float32)
+    if out is None:
+        out = np.empty_like(audio)
+    _noise_gate(audio, threshold, out)
+    return out
 
 
 class PiperTTS:
@@ -165,6 +285,7 @@ class PiperTTS:
 
         self.lock = threading.Lock()
         self.samplerate = None
+        self._out_stream = None  # opened lazily once the voice's sample rate is known
 
         # Non-blocking TTS queue
         self.speech_queue = queue.Queue()
@@ -192,31 +313,36 @@ class PiperTTS:
             except queue.Empty:
                 continue
             except Exception as e:
-                logger.error(f"Error in speech worker: {e}", exc_info=True)
+                logger.error("Error in speech worker: %s", e, exc_info=logger.isEnabledFor(logging.DEBUG))
                 self.is_speaking.clear()
 
     def _speak_blocking(self, text: str):
         """Internal blocking speech synthesis"""
         with self.lock:
-            logger.info(f"Speaking: {text[:50]}{'...' if len(text) > 50 else ''}")
+            logger.info("Speaking: %s%s", text[:50], '...' if len(text) > 50 else '')
             try:
-                audio_segments = []
+                # Stream each chunk as it is synthesized so playback starts on the first one
+                wrote_audio = False
                 for chunk in self.voice.synthesize(text):
                     if self.samplerate is None:
                         self.samplerate = chunk.sample_rate
-                        logger.debug(f"TTS sample rate: {self.samplerate} Hz")
-                    audio_segments.append(chunk.audio_float_array)
+                        logger.debug("TTS sample rate: %s Hz", self.samplerate)
+                    self._output_stream().write(chunk.audio_float_array)
+                    wrote_audio = True
 
-                if not audio_segments:
+                if not wrote_audio:
                     logger.warning("No audio data generated")
-                    return
-
-                audio = np.concatenate(audio_segments)
-                sd.play(audio, samplerate=self.samplerate)
-                sd.wait()
 
             except Exception as e:
-                logger.error(f"TTS error for '{text[:30]}...': {e}", exc_info=True)
+                logger.error("TTS error for '%s...': %s", text[:30], e,
+                             exc_info=logger.isEnabledFor(logging.DEBUG))
+
+    def _output_stream(self) -> sd.OutputStream:
+        """Return the persistent playback stream, opening it on first use"""
+        if self._out_stream is None:
+            self._out_stream = sd.OutputStream(samplerate=self.samplerate, channels=1, dtype='float32')
+            self._out_stream.start()
+        return self._out_stream
 
     def speak(self, text: str, blocking: bool = False):
         if blocking:
@@ -235,6 +361,17 @@ class PiperTTS:
         self.speech_queue.put(None)
         self.speech_thread.join(timeout=2)
 
+        # Writers hold self.lock, so never close the stream under a write in progress
+        if not self.lock.acquire(timeout=5):
+            logger.warning("TTS worker still writing, leaving the output stream open")
+            return
+        try:
+            if self._out_stream is not None:
+                self._out_stream.close()
+                self._out_stream = None
+        finally:
+            self.lock.release()
+
 
 class WakeWordDetector:
     """Simple wake word detection using fuzzy matching"""
@@ -247,10 +384,13 @@ class WakeWordDetector:
         self.timeout = WAKE_WORD_TIMEOUT
         logger.info(f"Wake word detector initialized: '{wake_word}'")
 
-    def check(self, text: str) -> bool:
+    def check(self, text: str, wake_detected: Optional[bool] = None) -> bool:
+        """Update wake state for text; wake_detected skips the substring scan if already known"""
         text_lower = text.lower().strip()
+        if wake_detected is None:
+            wake_detected = self.wake_word in text_lower
 
-        if self.wake_word in text_lower:
+        if wake_detected:
             logger.info("Wake word detected!")
             self.is_awake = True
             self.last_wake_time = time.time()
@@ -301,11 +441,52 @@ class VoiceAssistant:
             "goodbye": self._skill_exit,
             "sleep": self._skill_sleep,
         }
+        self._cmd_automaton = self._build_command_automaton()
 
-        self.audio_q = queue.Queue()
         self.keep_running = True
         self.sample_rate = self.config['audio']['sample_rate']
 
+        # Config is constant at runtime; bind hot-path values once
+        audio_config = self.config['audio']
+        self._chunk_samples = int(round(self.sample_rate * audio_config['chunk_duration_seconds']))
+        self._rms_threshold = audio_config['rms_threshold']
+        self._peak_threshold = audio_config['peak_threshold']
+        self._zcr_threshold = audio_config['zcr_threshold']
+        self._noise_gate_threshold = audio_config['noise_gate_threshold']
+        self._restart_delay = self.config['error_recovery']['restart_delay_seconds']
+        self._debug = logger.isEnabledFor(logging.DEBUG)
+
+        # Single-producer/single-consumer slots filled by the audio callback
+        slot_len = audio_config['blocksize'] or AUDIO_VARIABLE_BLOCK_FRAMES
+        self._rb = np.empty((AUDIO_RING_SLOTS, slot_len), dtype=np.float32)
+        self._rb_frames = [0] * AUDIO_RING_SLOTS
+        self._w = 0  # blocks written (callback thread)
+        self._r = 0  # blocks consumed (listen loop)
+        self._block_ready = threading.Event()
+
+        # Preallocated capture ring, one chunk long, scanned in overlapping windows
+        self._ring = np.empty(self._chunk_samples, dtype=np.float32)
+        self._ring_pos = 0
+        self._window_samples = min(int(self.sample_rate * audio_config['window_seconds']), self._chunk_samples)
+        self._hop_samples = max(1, int(self.sample_rate * audio_config['hop_seconds']))
+        if self._hop_samples > self._window_samples:
+            # Windows must overlap or touch, the quiet-ring trim keeps window - hop samples
+            raise ValueError(
+                f"audio.hop_seconds ({audio_config['hop_seconds']}) must not exceed "
+                f"audio.window_seconds ({self._window_samples / self.sample_rate:g} s after "
+                f"clamping to chunk_duration_seconds)"
+            )
+        max_windows = (self._chunk_samples - self._window_samples) // self._hop_samples + 1
+        self._win_stats = np.empty((max_windows, 3), dtype=np.float64)
+
+        # Transcription worker; gated chunks use pooled buffers (queue slots + one in flight)
+        self._transcribe_q = queue.Queue(maxsize=2)
+        self._gate_pool = queue.Queue()
+        for _ in range(self._transcribe_q.maxsize + 1):
+            self._gate_pool.put(np.empty(self._chunk_samples, dtype=np.float32))
+        self._transcribe_thread = threading.Thread(target=self._transcribe_worker, daemon=True)
+        self._transcribe_thread.start()
+
         logger.info("Voice Assistant initialized successfully")
 
     def _initialize_whisper(self):
@@ -317,18 +498,79 @@ class VoiceAssistant:
                     f"Local Whisper model files not found at '{WHISPER_MODEL_DIR}'"
                 )
 
-            logger.info(f"Loading Whisper model from: {WHISPER_MODEL_DIR}")
-            self.model = WhisperModel(
-                WHISPER_MODEL_DIR,
-                device=self.config['whisper']['device'],
-                compute_type=self.config['whisper']['compute_type']
+            whisper_config = self.config['whisper']
+            self.model = self._load_whisper_model(WHISPER_MODEL_DIR)
+
+            # Transcription settings are constant at runtime; build them once here
+            vad_config = whisper_config['vad']
+            self._vad_params = {
+                "threshold": vad_config['threshold'],
+                "min_speech_duration_ms": vad_config['min_speech_duration_ms'],
+                "max_speech_duration_s": vad_config['max_speech_duration_s'],
+                "min_silence_duration_ms": vad_config['min_silence_duration_ms'],
+                "speech_pad_ms": vad_config['speech_pad_ms'],
+            }
+            self._transcribe_kwargs = self._build_transcribe_kwargs(self.model)
+
+            # Cheap greedy model for wake-word detection while asleep
+            wake_dir = whisper_config.get('wake_model_dir')
+            wake_path = os.path.join(os.path.dirname(__file__), wake_dir) if wake_dir else None
+            if not wake_path or os.path.abspath(wake_path) == os.path.abspath(WHISPER_MODEL_DIR):
+                self.wake_model = self.model
+            elif os.path.exists(os.path.join(wake_path, "model.bin")):
+                self.wake_model = self._load_whisper_model(wake_path)
+            else:
+                logger.warning(f"Wake model not found at '{wake_path}', using main model for wake detection")
+                self.wake_model = self.model
+            self._wake_transcribe_kwargs = self._build_transcribe_kwargs(
+                self.wake_model, beam_size=1, best_of=1, vad_filter=True
             )
-            logger.info("Whisper model loaded successfully")
 
         except Exception as e:
             logger.critical(f"Failed to initialize Whisper: {e}", exc_info=True)
             raise
 
+    def _load_whisper_model(self, model_dir: str) -> WhisperModel:
+        """Load a local Whisper model with the configured device and threading"""
+        whisper_config = self.config['whisper']
+        device = whisper_config['device']
+        compute_type = select_compute_type(device, whisper_config['compute_type'])
+        cpu_threads = whisper_config['cpu_threads'] or os.cpu_count() or 0
+
+        return _cached_whisper_model(
+            os.path.abspath(model_dir), device, compute_type, cpu_threads, whisper_config['num_workers']
+        )
+
+    def _build_transcribe_kwargs(self, model: WhisperModel, **overrides) -> dict:
+        """Build the constant transcribe() keyword arguments for a model"""
+        whisper_config = self.config['whisper']
+        trans_config = whisper_config['transcription']
+
+        # Pre-tokenize the accent prompt (same encoding faster-whisper applies to a str prompt);
+        # done per model since tiny.en and multilingual models use different vocabularies
+        accent_prompt = whisper_config.get('accent_prompt', '').strip()
+        prompt_tokens = None
+        if accent_prompt:
+            prompt_tokens = model.hf_tokenizer.encode(
+                " " + accent_prompt, add_special_tokens=False
+            ).ids
+
+        kwargs = dict(
+            vad_filter=whisper_config['vad']['enabled'],
+            language=trans_config['language'],
+            beam_size=trans_config['beam_size'],
+            best_of=trans_config['best_of'],
+            temperature=trans_config['temperature'],
+            compression_ratio_threshold=trans_config['compression_ratio_threshold'],
+            log_prob_threshold=trans_config['log_prob_threshold'],
+            no_speech_threshold=trans_config['no_speech_threshold'],
+            condition_on_previous_text=False,
+            initial_prompt=prompt_tokens,
+            word_timestamps=False,
+        )
+        kwargs.update(overrides)
+        return kwargs
+
     def _initialize_tts(self):
         try:
             model_file = self.config['piper']['model_file']
@@ -383,83 +625,221 @@ class VoiceAssistant:
     # --- Core Logic ---
     def callback(self, indata, frames, time_info, status):
         if status:
-            logger.warning(f"Audio callback status: {status}")
-        self.audio_q.put(indata.copy())
+            logger.warning("Audio callback status: %s", status)
+        n_slots = len(self._rb)
+        if self._w - self._r >= n_slots:
+            logger.warning("Audio ring full, dropping input block")
+            return
+
+        # Copy into a preallocated slot; only this thread advances _w
+        slot = self._w % n_slots
+        if frames > self._rb.shape[1]:
+            logger.warning("Audio block of %d frames truncated to %d", frames, self._rb.shape[1])
+            frames = self._rb.shape[1]
+        self._rb[slot, :frames] = indata[:frames, 0]
+        self._rb_frames[slot] = frames
+        self._w += 1
+        self._block_ready.set()
+
+    def _build_command_automaton(self):
+        """Build one Aho-Corasick automaton over the wake word and all skill triggers"""
+        automaton = ahocorasick.Automaton()
+        for trigger, skill_func in self.command_map.items():
+            automaton.add_word(trigger, (trigger, skill_func))
+        wake_word = self.wake_word_detector.wake_word
+        automaton.add_word(wake_word, (wake_word, None))
+        automaton.make_automaton()
+        return automaton
+
+    def _scan_command(self, text: str):
+        """
+        Scan text once for wake word occurrences and skill triggers.
+
+        Returns:
+            (wake_spans, trigger, skill_func) where wake_spans are non-overlapping
+            (start, end) spans of the wake word and trigger is the first skill
+            trigger outside them, or (wake_spans, None, None) if there is none.
+        """
+        wake_spans = []
+        trigger_hits = []
+        for end, (key, skill_func) in self._cmd_automaton.iter(text):
+            start = end - len(key) + 1
+            if skill_func is None:
+                if not wake_spans or start >= wake_spans[-1][1]:
+                    wake_spans.append((start, end + 1))
+            else:
+                trigger_hits.append((start, end + 1, key, skill_func))
+
+        for start, end, key, skill_func in trigger_hits:
+            if not any(start < w_end and end > w_start for w_start, w_end in wake_spans):
+                return wake_spans, key, skill_func
+        return wake_spans, None, None
 
     def handle_command(self, text: str):
         text = text.lower().strip()
         if not text:
             return
 
-        logger.info(f"Recognized: '{text}'")
+        logger.info("Recognized: '%s'", text)
 
-        if not self.wake_word_detector.check(text):
+        wake_spans, trigger, skill_func = self._scan_command(text)
+        if not self.wake_word_detector.check(text, wake_detected=bool(wake_spans)):
             logger.debug("Wake word not detected, ignoring command")
             return
 
-        command_text = text.replace(WAKE_WORD, "").strip()
-        if not command_text and text != WAKE_WORD:
+        # Slice the wake word out using the spans found by the scan
+        pieces = []
+        prev_end = 0
+        for start, end in wake_spans:
+            pieces.append(text[prev_end:start])
+            prev_end = end
+        pieces.append(text[prev_end:])
+        command_text = "".join(pieces).strip()
+
+        if not command_text:
+            if text == self.wake_word_detector.wake_word:
+                self.tts.speak("Yes? I'm listening.")
             return
 
-        if not command_text or command_text == WAKE_WORD:
-            self.tts.speak("Yes? I'm listening.")
+        if skill_func is not None:
+            logger.info("Executing skill: %s", trigger)
+            try:
+                skill_func()
+            except Exception as e:
+                logger.error("Error executing skill '%s': %s", trigger, e, exc_info=True)
+                self.tts.speak("Sorry, something went wrong.")
             return
 
-        for trigger, skill_func in self.command_map.items():
-            if trigger in command_text:
-                logger.info(f"Executing skill: {trigger}")
-                try:
-                    skill_func()
-                except Exception as e:
-                    logger.error(f"Error executing skill '{trigger}': {e}", exc_info=True)
-                    self.tts.speak("Sorry, something went wrong.")
-                return
-
-        logger.debug(f"No matching command for: {command_text}")
+        logger.debug("No matching command for: %s", command_text)
         self.tts.speak(f"I heard you say {command_text}, but I don't know what to do with that yet.")
 
     def transcribe_audio(self, audio_buffer: np.ndarray) -> list:
         """Transcribe audio using config-based settings"""
         try:
-            vad_config = self.config['whisper']['vad']
-            trans_config = self.config['whisper']['transcription']
+            # Asleep: only the wake word matters, so use the cheap greedy model
+            if self.wake_word_detector.is_awake:
+                model, kwargs = self.model, self._transcribe_kwargs
+            else:
+                model, kwargs = self.wake_model, self._wake_transcribe_kwargs
 
-            segments, info = self.model.transcribe(
+            segments, _ = model.transcribe(
                 audio_buffer,
-
-                # VAD settings from config
-                vad_filter=vad_config['enabled'],
-                vad_parameters={
-                    "threshold": vad_config['threshold'],
-                    "min_speech_duration_ms": vad_config['min_speech_duration_ms'],
-                    "max_speech_duration_s": vad_config['max_speech_duration_s'],
-                    "min_silence_duration_ms": vad_config['min_silence_duration_ms'],
-                    "speech_pad_ms": vad_config['speech_pad_ms'],
-                },
-
-                # Transcription settings from config
-                language=trans_config['language'],
-                beam_size=trans_config['beam_size'],
-                best_of=trans_config['best_of'],
-                temperature=trans_config['temperature'],
-                compression_ratio_threshold=trans_config['compression_ratio_threshold'],
-                log_prob_threshold=trans_config['log_prob_threshold'],
-                no_speech_threshold=trans_config['no_speech_threshold'],
-                condition_on_previous_text=False,
-
-                # Accent prompt from config
-                initial_prompt=self.config['whisper'].get('accent_prompt', ''),
-
-                # Performance settings
-                word_timestamps=False,
+                vad_parameters=self._vad_params,
+                **kwargs
             )
 
             return list(segments)
 
         except Exception as e:
-            logger.error(f"Transcription error: {e}", exc_info=True)
+            logger.error("Transcription error: %s", e, exc_info=logger.isEnabledFor(logging.DEBUG))
             return []
 
+    def _append_block(self, block: np.ndarray):
+        """Copy a captured block into the chunk ring, scanning for speech every hop"""
+        chunk_size = self._chunk_samples
+        while len(block):
+            prev_pos = self._ring_pos
+            take = min(len(block), chunk_size - prev_pos)
+            self._ring[prev_pos:prev_pos + take] = block[:take]
+            self._ring_pos += take
+            block = block[take:]
+
+            if self._ring_pos // self._hop_samples > prev_pos // self._hop_samples \
+                    or self._ring_pos >= chunk_size:
+                self._scan_windows()
+
+    def _scan_windows(self):
+        """
+        Run the energy gate over overlapping windows of the ring and flush speech.
+
+        The ring is trimmed while no window is hot, so it always starts just
+        before the first hot window. Speech is submitted as soon as the newest
+        window goes quiet, instead of waiting for a fixed chunk boundary.
+        """
+        pos = self._ring_pos
+        window, hop = self._window_samples, self._hop_samples
+        if pos < window:
+            return
+
+        windows = sliding_window_view(self._ring[:pos], window)[::hop]
+        stats = self._win_stats[:len(windows)]
+        _window_stats(windows, stats)
+        rms, peak, zcr = stats[:, 0], stats[:, 1], stats[:, 2]
+        hot = (rms > self._rms_threshold) | (peak > self._peak_threshold)
+        hot &= ~((rms < 2 * self._rms_threshold) & (zcr < self._zcr_threshold))
+
+        if not hot.any():
+            # Keep only the tail the next window still overlaps
+            keep = window - hop
+            self._ring[:keep] = self._ring[pos - keep:pos]
+            self._ring_pos = keep
+            return
+
+        if not hot[-1] or pos >= self._chunk_samples:
+            start = int(np.argmax(hot)) * hop
+            self._ring_pos = 0
+            self._process_chunk(self._ring[start:pos])
+
+    def _process_chunk(self, audio_chunk: np.ndarray):
+        """Gate, filter and transcribe one audio segment"""
+        rms, peak, zcr = _audio_stats(audio_chunk)
+
+        # Check if audio contains significant sound
+        if not (rms > self._rms_threshold or peak > self._peak_threshold):
+            if self._debug:
+                logger.debug("No significant audio detected, skipping")
+            return
+
+        # Quiet, low-ZCR chunks are hum or room noise; skip them before Whisper's VAD
+        if rms < 2 * self._rms_threshold and zcr < self._zcr_threshold:
+            if self._debug:
+                logger.debug("Low energy/ZCR chunk (rms=%.4f, zcr=%.4f), skipping", rms, zcr)
+            return
+
+        # Only transcribe if not currently speaking
+        if self.tts.is_speaking.is_set():
+            if self._debug:
+                logger.debug("TTS is speaking, skipping transcription")
+            return
+
+        # Borrow a gate buffer; if none is free the worker is backlogged
+        try:
+            gate_buf = self._gate_pool.get_nowait()
+        except queue.Empty:
+            if self._debug:
+                logger.debug("Transcription backlog, dropping chunk")
+            return
+
+        # Apply noise gate and hand the chunk to the transcription worker
+        n = len(audio_chunk)
+        _noise_gate(audio_chunk, self._noise_gate_threshold, gate_buf[:n])
+        self._transcribe_q.put_nowait((gate_buf, n))
+
+    def _transcribe_worker(self):
+        """Background worker that transcribes queued chunks and dispatches commands"""
+        while self.keep_running:
+            try:
+                gate_buf, n = self._transcribe_q.get(timeout=0.5)
+            except queue.Empty:
+                continue
+
+            try:
+                if self._debug:
+                    logger.debug("Transcribing audio chunk...")
+                segments = self.transcribe_audio(gate_buf[:n])
+
+                for segment in segments:
+                    text = segment.text.strip()
+                    if text:
+                        self.handle_command(text)
+
+            except Exception as e:
+                logger.error("Error in transcription worker: %s", e, exc_info=True)
+
+            finally:
+                self._gate_pool.put(gate_buf)
+                self._transcribe_q.task_done()
+
     def listen(self):
         try:
             # Get model and voice info for display
@@ -480,54 +860,31 @@ class VoiceAssistant:
             with sd.InputStream(
                     samplerate=self.sample_rate,
                     blocksize=self.config['audio']['blocksize'],
+                    latency=self.config['audio']['latency'],
                     dtype="float32",
                     channels=self.config['audio']['channels'],
                     callback=self.callback,
             ):
-                audio_buffer = np.array([], dtype=np.float32)
-                chunk_duration = self.config['audio']['chunk_duration_seconds']
-                CHUNK_SIZE_SAMPLES = self.sample_rate * chunk_duration
+                n_slots = len(self._rb)
 
                 while self.keep_running:
                     try:
-                        data = self.audio_q.get(timeout=0.5)
-                        audio_buffer = np.concatenate((audio_buffer, data.flatten()))
-
-                        if len(audio_buffer) >= CHUNK_SIZE_SAMPLES:
-                            # Check if audio contains significant sound
-                            if not is_significant_audio(audio_buffer):
-                                logger.debug("No significant audio detected, skipping")
-                                audio_buffer = np.array([], dtype=np.float32)
-                                continue
-
-                            # Apply noise gate
-                            audio_buffer = noise_gate(audio_buffer)
-
-                            # Only transcribe if not currently speaking
-                            if not self.tts.is_speaking.is_set():
-                                logger.debug("Transcribing audio chunk...")
-                                segments = self.transcribe_audio(audio_buffer)
-
-                                for segment in segments:
-                                    text = segment.text.strip()
-                                    if text:
-                                        self.handle_command(text)
-                            else:
-                                logger.debug("TTS is speaking, skipping transcription")
-
-                            # Clear buffer
-                            audio_buffer = np.array([], dtype=np.float32)
+                        if not self._block_ready.wait(timeout=0.5):
+                            continue
+                        self._block_ready.clear()
 
-                    except queue.Empty:
-                        continue
+                        # Drain every slot the callback has published since the last wakeup
+                        while self._r < self._w:
+                            slot = self._r % n_slots
+                            self._append_block(self._rb[slot, :self._rb_frames[slot]])
+                            self._r += 1
 
                     except Exception as e:
                         logger.error(f"Error in listen loop: {e}", exc_info=True)
                         if self.restart_count < self.max_restarts:
                             self.restart_count += 1
-                            restart_delay = self.config['error_recovery']['restart_delay_seconds']
                             logger.warning(f"Attempting recovery ({self.restart_count}/{self.max_restarts})")
-                            time.sleep(restart_delay)
+                            time.sleep(self._restart_delay)
                             continue
                         else:
                             logger.critical("Max restart attempts reached, shutting down")
@@ -546,6 +903,8 @@ class VoiceAssistant:
 
     def _cleanup(self):
         logger.info("Cleaning up resources...")
+        self.keep_running = False
+        self._transcribe_thread.join(timeout=2)
         try:
             self.tts.shutdown()
         except Exception as e:
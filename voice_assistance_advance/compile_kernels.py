@@ -0,0 +1,22 @@
+"""
+Ahead-of-time build of the Voice Assistant audio kernels
+Run once after installing requirements: python compile_kernels.py
+Produces the 'audio_kernels' extension module that ai.py imports
+instead of JIT-compiling the kernels at startup
+"""
+import os
+from numba.pycc import CC
+
+import dsp_kernels
+
+cc = CC('audio_kernels')
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+
+# AOT exports are serial; prange compiles as a plain range here
+cc.export('audio_stats', 'UniTuple(f8, 3)(f4[::1])')(dsp_kernels.audio_stats)
+cc.export('noise_gate', 'void(f4[::1], f4, f4[::1])')(dsp_kernels.noise_gate)
+
+
+if __name__ == "__main__":
+    cc.compile()
+    print(f"Built audio_kernels in {cc.output_dir}")
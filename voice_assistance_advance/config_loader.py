@@ -3,17 +3,41 @@ Configuration loader for Voice Assistant
 Handles loading and validation of configuration files
 """
 import os
-import yaml
+import copy
+import functools
+import pickle
+import re
 import logging
-from typing import Dict, Any
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional
 
 logger = logging.getLogger(__name__)
 
 
-class Config:
-    """Configuration manager with defaults"""
+@functools.lru_cache(maxsize=None)
+def _yaml():
+    """
+    Import PyYAML on first use; a cache hit never needs it.
+
+    Returns:
+        (yaml module, Loader, Dumper), using the libyaml C classes when available
+    """
+    import yaml
+
+    class Dumper(getattr(yaml, 'CSafeDumper', yaml.SafeDumper)):
+        """Safe dumper that also writes tuples (the default command phrases), as plain YAML lists"""
+
+    Dumper.add_representer(tuple, yaml.SafeDumper.represent_list)
+    return yaml, getattr(yaml, 'CSafeLoader', yaml.SafeLoader), Dumper
+
+
+_SPLIT_CACHE_MAX = 256  # dotted-path split memo size; reset wholesale when full
 
-    DEFAULT_CONFIG = {
+
+@functools.lru_cache(maxsize=None)
+def _build_default() -> Mapping[str, Any]:
+    """Default configuration template, built on first use and read-only"""
+    return MappingProxyType({
         'wake_word': {
             'phrase': 'hey assistant',
             'timeout': 10,
@@ -62,12 +86,33 @@ class Config:
             'restart_delay_seconds': 1
         },
         'commands': {
-            'joke': ['joke', 'tell me a joke', 'make me laugh'],
-            'time': ['time', 'what time is it', 'date'],
-            'sleep': ['sleep', 'go to sleep', 'deactivate'],
-            'exit': ['exit', 'goodbye', 'stop', 'quit']
+            'joke': ('joke', 'tell me a joke', 'make me laugh'),
+            'time': ('time', 'what time is it', 'date'),
+            'sleep': ('sleep', 'go to sleep', 'deactivate'),
+            'exit': ('exit', 'goodbye', 'stop', 'quit')
         }
-    }
+    })
+
+
+def default_config() -> Dict[str, Any]:
+    """Return a fresh, mutable copy of the default configuration"""
+    return copy.deepcopy(dict(_build_default()))
+
+
+class Config:
+    """
+    Configuration manager with defaults.
+
+    get() and [] return the live nested dicts. Write through set() or []=,
+    which rebuild the lookups derived from the config (the command index);
+    edits made in place on a returned dict are seen by get() but not by
+    match_command().
+    """
+
+    __slots__ = ('config_file', 'config', '_split_cache',
+                 '_command_index', '_command_re')
+
+    _instance: Optional['Config'] = None
 
     def __init__(self, config_file: str = 'config.yaml'):
         """
@@ -77,26 +122,101 @@ class Config:
             config_file: Path to YAML config file
         """
         self.config_file = config_file
-        self.config = self.DEFAULT_CONFIG.copy()
+        # Own copy so merging a user file never touches the shared template
+        self.config = default_config()
 
-        if os.path.exists(config_file):
-            self.load(config_file)
-        else:
-            logger.warning(f"Config file '{config_file}' not found, using defaults")
-            self.save(config_file)  # Save default config for reference
+        # Memoized dotted-path splits; values themselves are looked up every time
+        self._split_cache: Dict[str, list] = {}
+
+        # phrase -> command index and matching regex, built on first match_command()
+        self._command_index: Optional[Dict[str, str]] = None
+        self._command_re = None
+
+        self.load(config_file)  # writes the defaults out if the file is missing
+
+    @staticmethod
+    def _cache_path(config_file: str) -> str:
+        """Pickled parse of the YAML file, stored next to it"""
+        return config_file + '.cache'
+
+    @classmethod
+    def _read_cache(cls, config_file: str, stamp: tuple) -> Any:
+        """Return the cached parse if it was written for this (mtime_ns, size) stamp"""
+        try:
+            with open(cls._cache_path(config_file), 'rb') as f:
+                cached_stamp, user_config = pickle.load(f)
+        except (OSError, EOFError, ValueError, TypeError, pickle.UnpicklingError):
+            return None
+        return user_config if cached_stamp == stamp else None
+
+    @classmethod
+    def _write_cache(cls, config_file: str, stamp: tuple, user_config: Any):
+        """Atomically replace the parse cache"""
+        cache_path = cls._cache_path(config_file)
+        tmp_path = cache_path + '.tmp'
+        try:
+            with open(tmp_path, 'wb') as f:
+                pickle.dump((stamp, user_config), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            logger.debug(f"Could not write config cache {cache_path}: {e}")
+
+    @classmethod
+    def drop_cache(cls, config_file: str):
+        """Remove the parse cache after config_file is rewritten behind the loader's back"""
+        try:
+            os.remove(cls._cache_path(config_file))
+        except FileNotFoundError:
+            pass
+
+    @classmethod
+    def prime_cache(cls, config_file: str, user_config: Any):
+        """
+        Record user_config as the parse of config_file, so the next load skips YAML.
+
+        Only call this right after writing user_config to config_file.
+        """
+        try:
+            st = os.stat(config_file)
+        except OSError:
+            return
+        cls._write_cache(config_file, (st.st_mtime_ns, st.st_size), user_config)
+
+    @classmethod
+    def instance(cls, config_file: str = 'config.yaml') -> 'Config':
+        """Return the process-wide configuration, loading it on first use"""
+        if cls._instance is None:
+            cls._instance = cls(config_file)
+        return cls._instance
 
     def load(self, config_file: str):
-        """Load configuration from YAML file"""
+        """Load configuration from YAML file, reusing the parse cache while the file is unchanged"""
         try:
-            with open(config_file, 'r') as f:
-                user_config = yaml.safe_load(f)
+            st = os.stat(config_file)
+            stamp = (st.st_mtime_ns, st.st_size)
+
+            # The cache holds the parsed file, not the merged result, so new
+            # defaults still apply after an upgrade
+            user_config = self._read_cache(config_file, stamp)
+            if user_config is None:
+                # Parse from one in-memory buffer; libyaml decodes the UTF-8 itself
+                with open(config_file, 'rb') as f:
+                    data = f.read()
+                yaml, Loader, _ = _yaml()
+                user_config = yaml.load(data, Loader=Loader)
+                self._write_cache(config_file, stamp, user_config)
 
             if user_config:
                 self._merge_configs(self.config, user_config)
+                self._invalidate()
                 logger.info(f"Configuration loaded from {config_file}")
             else:
                 logger.warning(f"Empty config file: {config_file}")
 
+        except FileNotFoundError:
+            logger.warning(f"Config file '{config_file}' not found, using defaults")
+            self.save(config_file)  # Save default config for reference
+
         except Exception as e:
             logger.error(f"Failed to load config from {config_file}: {e}")
             logger.info("Using default configuration")
@@ -104,19 +224,78 @@ class Config:
     def save(self, config_file: str):
         """Save current configuration to YAML file"""
         try:
+            yaml, _, Dumper = _yaml()
             with open(config_file, 'w') as f:
-                yaml.dump(self.config, f, default_flow_style=False, sort_keys=False)
+                yaml.dump(self.config, f, Dumper=Dumper, default_flow_style=False, sort_keys=False)
             logger.info(f"Configuration saved to {config_file}")
+
+            # Stale now; the stamp check would catch it, but don't rely on mtime granularity
+            self.drop_cache(config_file)
         except Exception as e:
             logger.error(f"Failed to save config to {config_file}: {e}")
 
     def _merge_configs(self, base: Dict, update: Dict):
-        """Recursively merge update dict into base dict"""
-        for key, value in update.items():
-            if key in base and isinstance(base[key], dict) and isinstance(value, dict):
-                self._merge_configs(base[key], value)
-            else:
-                base[key] = value
+        """Recursively merge update dict into base dict (iteratively, over an explicit stack)"""
+        self._invalidate()
+        stack = [(base, update, False)]
+        while stack:
+            base_dict, update_dict, in_commands = stack.pop()
+            for key, value in update_dict.items():
+                # Exact type checks: YAML and the defaults only ever produce plain dicts
+                if type(value) is dict:
+                    base_value = base_dict.get(key)
+                    if type(base_value) is dict:
+                        # Phrase lists live under the top-level commands section
+                        nested_commands = in_commands or (base_dict is base and key == 'commands')
+                        stack.append((base_value, value, nested_commands))
+                        continue
+                if in_commands and type(value) is list:
+                    value = tuple(value)  # phrase lists are never mutated
+                base_dict[key] = value
+
+    def _invalidate(self):
+        """Drop lookups derived from the config after it changes"""
+        self._command_index = None
+        self._command_re = None
+
+    def _build_command_index(self):
+        """Flip commands into phrase -> command and compile one regex over all phrases"""
+        self._command_index = {
+            phrase.lower(): command
+            for command, phrases in self.config.get('commands', {}).items()
+            for phrase in phrases
+        }
+        if self._command_index:
+            # Longest first so multi-word phrases win over their single-word parts
+            alternatives = sorted(self._command_index, key=len, reverse=True)
+            self._command_re = re.compile(r'\b(' + '|'.join(map(re.escape, alternatives)) + r')\b')
+
+    def match_command(self, text: str) -> Optional[str]:
+        """
+        Find the command whose phrase appears in text.
+
+        Args:
+            text: Recognized text
+
+        Returns:
+            Command name, or None if no phrase matches
+        """
+        if self._command_index is None:
+            self._build_command_index()
+        if self._command_re is None:
+            return None
+
+        match = self._command_re.search(text.lower())
+        return self._command_index[match.group(1)] if match else None
+
+    def _split_key(self, key_path: str) -> list:
+        """Split a dotted path, memoized"""
+        keys = self._split_cache.get(key_path)
+        if keys is None:
+            if len(self._split_cache) >= _SPLIT_CACHE_MAX:
+                self._split_cache.clear()
+            keys = self._split_cache[key_path] = key_path.split('.')
+        return keys
 
     def get(self, key_path: str, default: Any = None) -> Any:
         """
@@ -129,7 +308,8 @@ class Config:
         Returns:
             Configuration value or default
         """
-        keys = key_path.split('.')
+        # Only the split is memoized; values are read through so in-place edits show up
+        keys = self._split_key(key_path)
         value = self.config
 
         for key in keys:
@@ -148,7 +328,7 @@ class Config:
             key_path: Dot-separated path
             value: Value to set
         """
-        keys = key_path.split('.')
+        keys = self._split_key(key_path)
         config = self.config
 
         for key in keys[:-1]:
@@ -157,6 +337,7 @@ class Config:
             config = config[key]
 
         config[keys[-1]] = value
+        self._invalidate()
 
     def __getitem__(self, key: str) -> Any:
         """Allow dict-like access"""
@@ -165,18 +346,12 @@ class Config:
     def __setitem__(self, key: str, value: Any):
         """Allow dict-like setting"""
         self.config[key] = value
-
-
-# Global config instance
-_config = None
+        self._invalidate()
 
 
 def get_config(config_file: str = 'config.yaml') -> Config:
     """Get global configuration instance"""
-    global _config
-    if _config is None:
-        _config = Config(config_file)
-    return _config
+    return Config.instance(config_file)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,57 @@
+"""
+Audio kernels for Voice Assistant
+Plain-Python loop bodies shared by the Numba JIT path in ai.py
+and the ahead-of-time build in compile_kernels.py
+"""
+import math
+
+try:
+    from numba import prange
+except ImportError:
+    prange = range
+
+
+def audio_stats(audio):
+    """Compute (rms, peak, zero-crossing rate) of a float32 buffer in a single pass."""
+    n = audio.shape[0]
+    ss = 0.0
+    pk = 0.0
+    zc = 0
+    prev_neg = audio[0] < 0
+    for i in range(n):
+        x = audio[i]
+        ss += x * x
+        pk = max(pk, abs(x))
+        neg = x < 0
+        if neg != prev_neg:
+            zc += 1
+        prev_neg = neg
+    return math.sqrt(ss / n), pk, zc / n
+
+
+def noise_gate(audio, threshold, out):
+    """Zero samples at or below threshold, writing into out in one pass."""
+    for i in prange(audio.shape[0]):
+        x = audio[i]
+        out[i] = x if (x if x >= 0 else -x) > threshold else 0.0
+
+
+def window_stats(windows, out):
+    """Compute (rms, peak, zero-crossing rate) for each row of a 2-D window view into out."""
+    n = windows.shape[1]
+    for w in prange(windows.shape[0]):
+        ss = 0.0
+        pk = 0.0
+        zc = 0
+        prev_neg = windows[w, 0] < 0
+        for i in range(n):
+            x = windows[w, i]
+            ss += x * x
+            pk = max(pk, abs(x))
+            neg = x < 0
+            if neg != prev_neg:
+                zc += 1
+            prev_neg = neg
+        out[w, 0] = math.sqrt(ss / n)
+        out[w, 1] = pk
+        out[w, 2] = zc / n
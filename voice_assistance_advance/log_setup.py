@@ -0,0 +1,58 @@
+"""
+Logging setup for Voice Assistant
+Shared by main.py and ai.py so the handler layout doesn't depend on which runs first
+"""
+import atexit
+import queue
+import logging
+import logging.handlers
+from typing import Optional
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+LOG_FILE = 'voice_assistant.log'
+
+_log_listener: Optional[logging.handlers.QueueListener] = None
+_memory_handler: Optional[logging.handlers.MemoryHandler] = None
+_file_handler: Optional[logging.FileHandler] = None
+
+
+def setup_logging(level: int = logging.INFO):
+    """
+    Route the root logger through one off-thread QueueListener.
+
+    Records are formatted where they are logged, then written by the listener
+    thread so file and console I/O never block the audio or transcription
+    threads. File writes are batched through a MemoryHandler and the log file
+    is only opened on the first flush; errors are flushed immediately.
+
+    Does nothing if logging is already configured, by an earlier call or by
+    the embedding application.
+    """
+    global _log_listener, _memory_handler, _file_handler
+    if _log_listener is not None or logging.getLogger().handlers:
+        return
+
+    _file_handler = logging.FileHandler(LOG_FILE, delay=True)
+    _memory_handler = logging.handlers.MemoryHandler(512, flushLevel=logging.ERROR, target=_file_handler)
+    log_queue = queue.Queue(-1)
+    _log_listener = logging.handlers.QueueListener(log_queue, _memory_handler, logging.StreamHandler())
+
+    logging.basicConfig(
+        level=level,
+        format=LOG_FORMAT,
+        handlers=[logging.handlers.QueueHandler(log_queue)]
+    )
+    _log_listener.start()
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging():
+    """Drain the log queue, write out batched records and close the log file"""
+    global _log_listener
+    if _log_listener is None:
+        return
+
+    _log_listener.stop()
+    _log_listener = None
+    _memory_handler.close()
+    _file_handler.close()
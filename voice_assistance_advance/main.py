@@ -4,17 +4,11 @@ Production Entry Point with Error Handling
 """
 import sys
 import logging
-from ai import VoiceAssistant
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('voice_assistant.log'),
-        logging.StreamHandler()
-    ]
-)
+
+from log_setup import setup_logging, shutdown_logging
+
+# Configured before ai is imported; ai's own setup_logging() call is then a no-op
+setup_logging()
 logger = logging.getLogger(__name__)
 
 
@@ -26,6 +20,8 @@ def main():
         logger.info("Voice Assistant Starting...")
         logger.info("=" * 60)
 
+        # Deferred: ai pulls in the whole speech stack (faster-whisper, piper, numpy)
+        from ai import VoiceAssistant
         assistant = VoiceAssistant()
         assistant.listen()
 
@@ -75,6 +71,9 @@ def main():
         logger.info("Voice Assistant terminated")
         print("\nGoodbye!")
 
+        # Drain the queue, then write out whatever is still buffered
+        shutdown_logging()
+
 
 if __name__ == "__main__":
     sys.exit(main())
@@ -2,16 +2,135 @@
 Quick Tune - Interactive configuration tuner for Voice Assistant
 Helps adjust VAD settings based on your environment
 """
-import yaml
+import functools
+import math
 import os
+import re
 import sys
 from pathlib import Path
 
+from config_loader import Config, _yaml, default_config
+
+
+@functools.lru_cache(maxsize=64)
+def _split_key(key_path):
+    """Split a dotted path into a key tuple; safe to cache since paths are immutable strings"""
+    return tuple(key_path.split('.'))
+
+
+# `key:` line of a block mapping; group 3 is the rest of the line
+_YAML_KEY = re.compile(r'^(\s*)([\w-]+):(.*)$')
+# Plain scalar value with an optional trailing comment
+_YAML_VALUE = re.compile(r'^([ \t]+)([^\s#\'"\[{|>&*!][^#]*?)([ \t]+#.*)?$')
+
+
+def _format_scalar(value):
+    """YAML spelling of a preset value, or None if the line writer can't emit it"""
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, int):
+        return repr(value)
+    if isinstance(value, float):
+        # PyYAML (YAML 1.1) reads 1e-05 back as a string, and nan/inf need
+        # special spellings, so only plain fixed-notation floats are patched
+        text = repr(value)
+        if math.isfinite(value) and 'e' not in text:
+            return text
+    return None
+
+
+def _apply_preset_fast(config_file, settings):
+    """
+    Patch preset values into a YAML config line by line, keeping its comments.
+
+    Existing leaf keys are rewritten in place and missing ones are added at the
+    end of their parent section. Anything else is left to the full YAML round-trip.
+
+    Args:
+        config_file: Path to the YAML config
+        settings: Preset settings, key tuple -> scalar value
+
+    Returns:
+        True if every setting was written, False if the file was left untouched
+    """
+    pending = {}
+    for keys, value in settings.items():
+        text = _format_scalar(value)
+        if text is None:
+            return False
+        pending[keys] = text
+
+    try:
+        with open(config_file, encoding='utf-8') as f:
+            lines = f.readlines()
+    except FileNotFoundError:
+        return False
+
+    stack = []     # (indent, key path) of the mappings enclosing the current line
+    sections = {}  # mapping key path -> [indent of its children, index of its last line]
+    for i, line in enumerate(lines):
+        body = line.rstrip('\r\n')
+        stripped = body.lstrip()
+        if not stripped or stripped.startswith('#'):
+            continue
+        indent = len(body) - len(stripped)
+        while stack and stack[-1][0] >= indent:
+            stack.pop()
+        if stack:
+            sections.setdefault(stack[-1][1], [indent, i])
+        for _, path in stack:
+            sections[path][1] = i
+
+        match = _YAML_KEY.match(body)
+        if match is None:
+            continue  # list item or continuation line
+        path = (stack[-1][1] if stack else ()) + (match.group(2),)
+        rest = match.group(3)
+
+        if path in pending:
+            value = _YAML_VALUE.match(rest)
+            if value is None:
+                return False
+            lines[i] = (f"{match.group(1)}{match.group(2)}:{value.group(1)}"
+                        f"{pending.pop(path)}{value.group(3) or ''}{line[len(body):]}")
+        elif not rest.strip() or rest.lstrip().startswith('#'):
+            stack.append((indent, path))
+
+    inserts = []
+    for n, (keys, text) in enumerate(pending.items()):
+        section = sections.get(keys[:-1])
+        if section is None:
+            return False
+        child_indent, last = section
+        if not lines[last].endswith('\n'):
+            lines[last] += '\n'
+        inserts.append((last + 1, n, f"{' ' * child_indent}{keys[-1]}: {text}\n"))
+    for at, _, new_line in sorted(inserts, reverse=True):
+        lines.insert(at, new_line)
+
+    tmp_path = config_file + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.writelines(lines)
+    os.replace(tmp_path, config_file)
+
+    # A value swap can keep the file size, so don't trust the cache stamp
+    Config.drop_cache(config_file)
+    return True
+
+
+def _prepare_presets(presets):
+    """Pre-split preset setting paths into key tuples, once at import"""
+    for preset in presets.values():
+        preset['settings'] = {_split_key(k): v for k, v in preset['settings'].items()}
+    return presets
+
 
 class QuickTune:
     """Interactive configuration tuner"""
 
-    PRESETS = {
+    __slots__ = ('config_file', 'config', '_dirty')
+
+    PRESETS = _prepare_presets({
         'quiet': {
             'name': 'Quiet Room',
             'description': 'Library, office, bedroom',
@@ -49,52 +168,49 @@ class QuickTune:
                 'whisper.vad.min_speech_duration_ms': 350,
             }
         },
-    }
+    })
 
     def __init__(self, config_file='config.yaml'):
         self.config_file = config_file
+        self._dirty = False  # only rewrite the YAML if something changed
         self.config = self.load_config()
 
     def load_config(self):
         """Load existing configuration"""
-        if not os.path.exists(self.config_file):
+        # Parse from one in-memory buffer; libyaml decodes the UTF-8 itself
+        try:
+            with open(self.config_file, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
             print(f"Config file '{self.config_file}' not found.")
             print("Creating from default...")
+            self._dirty = True
             return self.create_default_config()
-
-        with open(self.config_file, 'r') as f:
-            return yaml.safe_load(f)
+        yaml, Loader, _ = _yaml()
+        return yaml.load(data, Loader=Loader)
 
     def save_config(self):
         """Save configuration to file"""
+        if not self._dirty:
+            print(f"\nNo changes to save, {self.config_file} left as is")
+            return
+
+        yaml, _, Dumper = _yaml()
         with open(self.config_file, 'w') as f:
-            yaml.dump(self.config, f, default_flow_style=False, sort_keys=False)
+            yaml.dump(self.config, f, Dumper=Dumper, default_flow_style=False, sort_keys=False)
+        self._dirty = False
         print(f"\n✓ Configuration saved to {self.config_file}")
 
+        # Hand the voice assistant's Config loader the parse of what we just wrote
+        Config.prime_cache(self.config_file, self.config)
+
     def create_default_config(self):
         """Create default configuration"""
-        return {
-            'wake_word': {
-                'phrase': 'hey assistant',
-                'timeout': 10,
-                'threshold': 0.7
-            },
-            'whisper': {
-                'vad': {
-                    'threshold': 0.5,
-                    'min_speech_duration_ms': 250,
-                    'no_speech_threshold': 0.6,
-                },
-                'transcription': {
-                    'no_speech_threshold': 0.6,
-                    'beam_size': 5,
-                }
-            }
-        }
+        return default_config()
 
     def set_value(self, key_path, value):
-        """Set configuration value using dot notation"""
-        keys = key_path.split('.')
+        """Set configuration value using dot notation or a pre-split key tuple"""
+        keys = key_path if isinstance(key_path, tuple) else _split_key(key_path)
         config = self.config
 
         for key in keys[:-1]:
@@ -103,10 +219,11 @@ class QuickTune:
             config = config[key]
 
         config[keys[-1]] = value
+        self._dirty = True
 
     def get_value(self, key_path, default=None):
-        """Get configuration value using dot notation"""
-        keys = key_path.split('.')
+        """Get configuration value using dot notation or a pre-split key tuple"""
+        keys = key_path if isinstance(key_path, tuple) else _split_key(key_path)
         value = self.config
 
         for key in keys:
@@ -129,7 +246,7 @@ class QuickTune:
 
         for key, value in preset['settings'].items():
             self.set_value(key, value)
-            print(f"  {key} = {value}")
+            print(f"  {'.'.join(key)} = {value}")
 
         return True
 
@@ -160,27 +277,30 @@ class QuickTune:
 
     def show_menu(self):
         """Display main menu"""
-        print("\n" + "="*60)
-        print("VOICE ASSISTANT - QUICK TUNE")
-        print("="*60)
-        print("\n1. Select Environment Preset")
-        print("2. Adjust Noise Sensitivity")
-        print("3. Adjust Speech Detection")
-        print("4. Adjust Wake Word")
-        print("5. Adjust Performance")
-        print("6. View Current Settings")
-        print("7. Save and Exit")
+        # One write per screen rather than a print per line
+        sys.stdout.write("\n".join([
+            "",
+            "="*60,
+            "VOICE ASSISTANT - QUICK TUNE",
+            "="*60,
+            "",
+            "1. Select Environment Preset",
+            "2. Adjust Noise Sensitivity",
+            "3. Adjust Speech Detection",
+            "4. Adjust Wake Word",
+            "5. Adjust Performance",
+            "6. View Current Settings",
+            "7. Save and Exit",
+        ]) + "\n")
 
     def select_preset(self):
         """Select environment preset"""
-        print("\n" + "-"*60)
-        print("ENVIRONMENT PRESETS")
-        print("-"*60)
+        lines = ["", "-"*60, "ENVIRONMENT PRESETS", "-"*60]
 
         presets = list(self.PRESETS.items())
         for i, (key, preset) in enumerate(presets, 1):
-            print(f"\n{i}. {preset['name']}")
-            print(f"   {preset['description']}")
+            lines += ["", f"{i}. {preset['name']}", f"   {preset['description']}"]
+        sys.stdout.write("\n".join(lines) + "\n")
 
         choice = input(f"\nSelect preset (1-{len(presets)}) or 0 to cancel: ").strip()
 
@@ -352,10 +472,6 @@ class QuickTune:
 
     def view_current_settings(self):
         """Display current configuration"""
-        print("\n" + "-"*60)
-        print("CURRENT SETTINGS")
-        print("-"*60)
-
         settings = [
             ('Wake Word', 'wake_word.phrase'),
             ('Wake Timeout', 'wake_word.timeout'),
@@ -367,15 +483,33 @@ class QuickTune:
             ('Beam Size', 'whisper.transcription.beam_size'),
         ]
 
-        for label, key in settings:
-            value = self.get_value(key, 'N/A')
-            print(f"{label:25s}: {value}")
+        lines = ["", "-"*60, "CURRENT SETTINGS", "-"*60]
+        lines.extend(f"{label:25s}: {self.get_value(key, 'N/A')}" for label, key in settings)
+        sys.stdout.write("\n".join(lines) + "\n")
 
         input("\nPress Enter to continue...")
 
 
 def main():
     """Main entry point"""
+    if '--preset' in sys.argv:
+        i = sys.argv.index('--preset')
+        preset_key = sys.argv[i + 1] if i + 1 < len(sys.argv) else None
+        if preset_key not in QuickTune.PRESETS:
+            print(f"Unknown preset: {preset_key}")
+            print(f"Available presets: {', '.join(QuickTune.PRESETS)}")
+            return 1
+
+        preset = QuickTune.PRESETS[preset_key]
+        if _apply_preset_fast('config.yaml', preset['settings']):
+            print(f"✓ Preset '{preset['name']}' written to config.yaml")
+        else:
+            # Layout the line writer can't patch, fall back to a full load and save
+            tuner = QuickTune()
+            tuner.apply_preset(preset_key)
+            tuner.save_config()
+        return 0
+
     print("="*60)
     print("VOICE ASSISTANT - QUICK CONFIGURATION TUNER")
     print("="*60)
@@ -236,6 +236,12 @@ def test_config_loading():
         print(f"  VAD threshold: {vad_threshold}")
         print(f"  Sample rate: {sample_rate} Hz")
 
+        # [] hands out live sub-dicts, get() must see edits made through them
+        config['whisper']['vad']['threshold'] = 0.9
+        if config.get('whisper.vad.threshold') != 0.9:
+            print("✗ get() returned a stale value after a nested edit")
+            return False
+
         return True
 
     except Exception as e:
@@ -244,8 +250,68 @@ def test_config_loading():
         return True  # Not critical
 
 
+def test_preset_fast_path():
+    """Test 7: quick_tune --preset line writer matches a full YAML round-trip"""
+    print_test_header("Preset Fast Path")
+
+    try:
+        import contextlib
+        import io
+        import shutil
+        import tempfile
+        import yaml
+        from quick_tune import QuickTune, _apply_preset_fast
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'config.yaml')
+
+            # Each preset patched line by line must load back as the slow path's result
+            for key, preset in QuickTune.PRESETS.items():
+                shutil.copy('config.yaml', path)
+                with contextlib.redirect_stdout(io.StringIO()):
+                    tuner = QuickTune(path)
+                    tuner.apply_preset(key)
+
+                if not _apply_preset_fast(path, preset['settings']):
+                    print(f"✗ Preset '{key}' fell back on the shipped config.yaml")
+                    return False
+                with open(path) as f:
+                    if yaml.safe_load(f) != tuner.config:
+                        print(f"✗ Preset '{key}' differs from a full load and save")
+                        return False
+                print(f"✓ {key:12s} - matches full YAML round-trip")
+
+            # Layouts the writer can't patch must be left untouched for the fallback
+            settings = QuickTune.PRESETS['quiet']['settings']
+            fallbacks = {
+                'flow mapping': (settings, "whisper:\n  vad: {threshold: 0.5}\n"),
+                'quoted value': (settings, 'whisper:\n  vad:\n    threshold: "0.5"\n'),
+                'comment-only value': (settings, "whisper:\n  vad:\n    threshold:  # unset\n"),
+                'unknown section': (settings, "wake_word:\n  phrase: assistant\n"),
+                'exponent float': ({('whisper', 'vad', 'threshold'): 1e-05},
+                                   "whisper:\n  vad:\n    threshold: 0.5\n"),
+            }
+            for name, (case_settings, text) in fallbacks.items():
+                with open(path, 'w') as f:
+                    f.write(text)
+                patched = _apply_preset_fast(path, case_settings)
+                with open(path) as f:
+                    unchanged = f.read() == text
+                if patched or not unchanged:
+                    print(f"✗ {name} was patched instead of falling back")
+                    return False
+                print(f"✓ {name:18s} - falls back to full YAML round-trip")
+
+        return True
+
+    except Exception as e:
+        print(f"✗ Preset fast path test failed: {e}")
+        logger.error("Preset fast path error details:", exc_info=True)
+        return False
+
+
 def test_voice_assistant_init():
-    """Test 7: Initialize VoiceAssistant"""
+    """Test 8: Initialize VoiceAssistant"""
     print_test_header("Voice Assistant Initialization")
 
     try:
@@ -278,7 +344,7 @@ def test_voice_assistant_init():
 
 
 def test_microphone_recording():
-    """Test 8: Test microphone recording"""
+    """Test 9: Test microphone recording"""
     print_test_header("Microphone Recording Test")
 
     try:
@@ -355,6 +421,7 @@ def run_all_tests():
         ("Whisper Model", test_whisper_model),
         ("Piper TTS Model", test_piper_model),
         ("Configuration", test_config_loading),
+        ("Preset Fast Path", test_preset_fast_path),
         ("Voice Assistant Init", test_voice_assistant_init),
         ("Microphone Recording", test_microphone_recording),
     ]
@@ -1,32 +1,142 @@
 import os
+import atexit
 import queue
 import threading
+from collections import deque
 import numpy as np
 import sounddevice as sd
 from faster_whisper import WhisperModel
+from faster_whisper.vad import VadOptions, get_vad_model
 from piper import PiperVoice
+import onnxruntime
 import pyjokes
+import ahocorasick
+import calendar
 import datetime
+import functools
+import random
 import logging
-from typing import Optional, Callable
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional, Callable, NamedTuple
 import time
 
+# Optional whisper.cpp backend for 4-bit quantized models
+try:
+    from pywhispercpp.model import Model as WhisperCppModel
+    WHISPERCPP_AVAILABLE = True
+except ImportError:
+    WHISPERCPP_AVAILABLE = False
+
 # --- Logging Setup ---
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
+# Thread/process info is never shown in the format, so don't collect it per record
+logging.logThreads = False
+logging.logProcesses = False
+logging.logMultiprocessing = False
+
+# Records are formatted where they are logged, but written by a QueueListener
+# thread so file and console I/O never block the audio or transcription path
+if not logging.getLogger().handlers:
+    _log_queue = queue.Queue(-1)
+    _log_listener = QueueListener(
+        _log_queue,
         logging.FileHandler('voice_assistant.log'),
         logging.StreamHandler()
-    ]
-)
+    )
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[QueueHandler(_log_queue)]
+    )
+    _log_listener.start()
+    atexit.register(_log_listener.stop)
 logger = logging.getLogger(__name__)
 
 # --- Constants ---
 WHISPER_MODEL_DIR = os.path.join(os.path.dirname(__file__), "whisper_model")
+WHISPER_BACKEND = "faster_whisper"  # "faster_whisper" or "whispercpp"
+WHISPER_COMPUTE_TYPES = ("int8_float16", "int8")  # tried in order for faster_whisper
+WHISPERCPP_MODEL_PATH = os.path.join(os.path.dirname(__file__), "ggml-base.en-q4_0.bin")
+WHISPER_SAMPLE_RATE = 16000  # Whisper models take 16 kHz mono audio
 WAKE_WORD = "hey assistant"
 WAKE_WORD_TIMEOUT = 10  # seconds to stay active after wake word
 
+# Canned replies, rendered once at startup
+CANNED_REPLIES = {
+    "miss": "Sorry, I didn't catch that.",  # unrecognized command
+    "error": "Sorry, something went wrong.",  # a skill raised
+}
+CANNED_REPLY_INTERVAL_NS = 10 * 1_000_000_000  # at most one of each reply per 10 seconds
+
+# Spoken time, built without strftime; name tuples captured once at import
+TIME_TEMPLATE = "It is {hour:02d}:{minute:02d} {ampm}, on {weekday}, {month} {day:02d}."
+DAY_NAMES = tuple(calendar.day_name)
+MONTH_NAMES = tuple(calendar.month_name)
+
+# VAD segmentation: Silero VAD (bundled with faster-whisper) decides when an utterance ends
+VAD_HOP_SAMPLES = 4096  # audio fed to the VAD per step (256 ms at 16 kHz)
+VAD_FRAME_SAMPLES = 512  # Silero scores 32 ms frames, a hop is 8 of them
+VAD_TRAILING_SILENCE_MS = 500  # silence after speech before the utterance is transcribed
+VAD_SPEECH_PAD_MS = 200  # kept on each side of detected speech
+VAD_MAX_UTTERANCE_SECONDS = 10  # force a flush for very long utterances
+MIN_SPEECH_ENERGY = 1e-4  # mean-square level below which an utterance isn't transcribed
+
+
+class TranscriptSegment(NamedTuple):
+    """Segment with the fields handle_command relies on"""
+    start: float
+    end: float
+    text: str
+
+
+class TranscriptInfo(NamedTuple):
+    """Minimal stand-in for faster-whisper's TranscriptionInfo"""
+    language: str
+    duration: float
+
+
+class WhisperCppBackend:
+    """Adapter exposing a whisper.cpp model through faster-whisper's transcribe() shape"""
+
+    def __init__(self, model_path: str, language: str = "en"):
+        if not WHISPERCPP_AVAILABLE:
+            raise ImportError("pywhispercpp is not installed (pip install pywhispercpp)")
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(f"whisper.cpp model not found at {model_path}")
+
+        self.language = language
+        # whisper.cpp fixes the sampling strategy when the model is created and
+        # ignores beam_search under greedy decoding, so each pass gets its own model
+        options = dict(language=language, no_context=True, print_progress=False, print_realtime=False)
+        self.greedy_model = WhisperCppModel(model_path, params_sampling_strategy=0, **options)
+        self.beam_model = WhisperCppModel(model_path, params_sampling_strategy=1, **options)
+
+    def transcribe(self, audio: np.ndarray, beam_size: int = 5, temperature: float = 0.0,
+                   best_of: int = 5, no_speech_threshold: float = 0.6, **kwargs):
+        """
+        Transcribe audio, ignoring faster-whisper-only options such as vad_filter.
+
+        Returns:
+            (segments, info) matching faster-whisper's return value
+        """
+        if beam_size > 1:
+            raw_segments = self.beam_model.transcribe(
+                audio,
+                temperature=temperature,
+                no_speech_thold=no_speech_threshold,
+                beam_search={"beam_size": beam_size, "patience": -1.0},
+            )
+        else:
+            raw_segments = self.greedy_model.transcribe(
+                audio,
+                temperature=temperature,
+                no_speech_thold=no_speech_threshold,
+                greedy={"best_of": best_of},
+            )
+        # whisper.cpp timestamps are in centiseconds
+        segments = [TranscriptSegment(seg.t0 / 100.0, seg.t1 / 100.0, seg.text) for seg in raw_segments]
+        info = TranscriptInfo(self.language, len(audio) / WHISPER_SAMPLE_RATE)
+        return segments, info
+
 
 class PiperTTS:
     """Thread-safe Piper TTS class with non-blocking speech queue"""
@@ -37,13 +147,16 @@ class PiperTTS:
             raise FileNotFoundError(f"Piper model not found at {model_path}")
 
         self.voice = PiperVoice.load(model_path)
+        self._tune_session(model_path)
         logger.info("Piper voice loaded successfully.")
 
         self.lock = threading.Lock()
         self.samplerate = None
+        self._out_stream = None  # opened on first synthesized chunk, kept across utterances
 
-        # Non-blocking TTS queue
-        self.speech_queue = queue.Queue()
+        # Non-blocking TTS queue; deque append/popleft are atomic, the Event wakes the worker
+        self.speech_queue = deque()
+        self._speech_ready = threading.Event()
         self.is_speaking = threading.Event()
         self.shutdown_flag = threading.Event()
 
@@ -52,50 +165,110 @@ class PiperTTS:
         self.speech_thread.start()
         logger.info("TTS worker thread started")
 
+    def _tune_session(self, model_path: str):
+        """Recreate Piper's ONNX Runtime session with threading sized to this machine"""
+        options = onnxruntime.SessionOptions()
+        options.intra_op_num_threads = os.cpu_count() or 1
+        options.execution_mode = onnxruntime.ExecutionMode.ORT_SEQUENTIAL
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.enable_mem_pattern = True
+
+        # Piper doesn't take session options, so swap in a session built with ours
+        providers = self.voice.session.get_providers()
+        self.voice.session = onnxruntime.InferenceSession(
+            model_path, sess_options=options, providers=providers
+        )
+        logger.info(f"Piper session using {options.intra_op_num_threads} intra-op threads")
+
     def _speech_worker(self):
         """Background worker that processes speech queue"""
         while not self.shutdown_flag.is_set():
+            # Wait for speech request with timeout
+            if not self.speech_queue:
+                self._speech_ready.wait(timeout=0.5)
+                self._speech_ready.clear()
+                continue
+
+            # Flag before popping so wait_until_done never sees an empty queue mid-handoff
+            self.is_speaking.set()
             try:
-                # Wait for speech request with timeout
-                text = self.speech_queue.get(timeout=0.5)
-                if text is None:  # Shutdown signal
+                item = self.speech_queue.popleft()
+                if item is None:  # Shutdown signal
                     break
-
-                self.is_speaking.set()
-                self._speak_blocking(text)
-                self.is_speaking.clear()
-                self.speech_queue.task_done()
-
-            except queue.Empty:
-                continue
+                if isinstance(item, np.ndarray):
+                    self._play_blocking(item)
+                else:
+                    self._speak_blocking(item)
             except Exception as e:
-                logger.error(f"Error in speech worker: {e}", exc_info=True)
+                logger.error("Error in speech worker: %s", e, exc_info=logger.isEnabledFor(logging.DEBUG))
+            finally:
                 self.is_speaking.clear()
 
     def _speak_blocking(self, text: str):
         """Internal blocking speech synthesis"""
         with self.lock:
-            logger.info(f"Speaking: {text[:50]}{'...' if len(text) > 50 else ''}")
+            logger.info("Speaking: %s%s", text[:50], '...' if len(text) > 50 else '')
             try:
-                audio_segments = []
+                generated = False
 
+                # Stream each chunk to the device as soon as it is synthesized
                 for chunk in self.voice.synthesize(text):
                     if self.samplerate is None:
                         self.samplerate = chunk.sample_rate
-                        logger.debug(f"TTS sample rate: {self.samplerate} Hz")
+                        logger.debug("TTS sample rate: %s Hz", self.samplerate)
 
-                    audio_segments.append(chunk.audio_float_array)
+                    self._output_stream().write(chunk.audio_float_array.astype(np.float32, copy=False).tobytes())
+                    generated = True
 
-                if not audio_segments:
+                if not generated:
                     logger.warning("No audio data generated")
-                    return
-
-                audio = np.concatenate(audio_segments)
-                sd.play(audio, samplerate=self.samplerate)
-                sd.wait()
 
             except Exception as e:
-                logger.error(f"TTS error for '{text[:30]}...': {e}", exc_info=True)
+                logger.error("TTS error for '%s...': %s", text[:30], e,
+                             exc_info=logger.isEnabledFor(logging.DEBUG))
+
+    def _play_blocking(self, audio: np.ndarray):
+        """Internal blocking playback of audio from render()"""
+        with self.lock:
+            self._output_stream().write(audio.tobytes())
+
+    def _output_stream(self) -> sd.RawOutputStream:
+        """Return the persistent output stream, opening it on first use"""
+        if self._out_stream is None:
+            self._out_stream = sd.RawOutputStream(
+                samplerate=self.samplerate,
+                channels=1,
+                dtype='float32',
+                blocksize=1024,
+            )
+            self._out_stream.start()
+        return self._out_stream
+
+    def warmup(self):
+        """Synthesize a short phrase without playback so the first reply isn't delayed"""
+        start = time.time()
+        with self.lock:
+            for chunk in self.voice.synthesize("Ready."):
+                if self.samplerate is None:
+                    self.samplerate = chunk.sample_rate
+        logger.info(f"Piper warmed up in {time.time() - start:.2f}s")
+
+    def render(self, text: str) -> np.ndarray:
+        """Synthesize text into a float32 array that play() can replay without synthesis"""
+        with self.lock:
+            chunks = []
+            for chunk in self.voice.synthesize(text):
+                if self.samplerate is None:
+                    self.samplerate = chunk.sample_rate
+                chunks.append(chunk.audio_float_array)
+        if not chunks:
+            return np.zeros(0, dtype=np.float32)
+        return np.concatenate(chunks).astype(np.float32, copy=False)
+
+    def play(self, audio: np.ndarray):
+        """Queue pre-rendered audio for playback"""
+        self.speech_queue.append(audio)
+        self._speech_ready.set()
 
     def speak(self, text: str, blocking: bool = False):
         """
@@ -108,21 +281,33 @@ class PiperTTS:
         if blocking:
             self._speak_blocking(text)
         else:
-            self.speech_queue.put(text)
+            self.speech_queue.append(text)
+            self._speech_ready.set()
 
     def wait_until_done(self):
         """Wait until all queued speech is complete"""
-        self.speech_queue.join()
-        while self.is_speaking.is_set():
+        while self.speech_queue or self.is_speaking.is_set():
             time.sleep(0.1)
 
     def shutdown(self):
         """Gracefully shutdown TTS system"""
         logger.info("Shutting down TTS...")
         self.shutdown_flag.set()
-        self.speech_queue.put(None)  # Signal to stop
+        self.speech_queue.append(None)  # Signal to stop
+        self._speech_ready.set()
         self.speech_thread.join(timeout=2)
 
+        # Writers hold self.lock, so never close the stream under a write in progress
+        if not self.lock.acquire(timeout=5):
+            logger.warning("TTS worker still writing, leaving the output stream open")
+            return
+        try:
+            if self._out_stream is not None:
+                self._out_stream.close()
+                self._out_stream = None
+        finally:
+            self.lock.release()
+
 
 class WakeWordDetector:
     """Simple wake word detection using fuzzy matching"""
@@ -131,29 +316,34 @@ class WakeWordDetector:
         self.wake_word = wake_word.lower()
         self.threshold = threshold
         self.is_awake = False
-        self.last_wake_time = 0
-        self.timeout = WAKE_WORD_TIMEOUT
+        self.last_wake_ns = 0
+        self.timeout_ns = WAKE_WORD_TIMEOUT * 1_000_000_000  # monotonic, unaffected by clock changes
         logger.info(f"Wake word detector initialized: '{wake_word}'")
 
-    def check(self, text: str) -> bool:
+    def check(self, text_lower: str, wake_detected: Optional[bool] = None) -> bool:
         """
         Check if text contains wake word.
 
+        Args:
+            text_lower: Recognized text, already lowercased and stripped
+            wake_detected: Result of an earlier scan for the wake word, if already known
+
         Returns:
             True if wake word detected or system is awake
         """
-        text_lower = text.lower().strip()
+        if wake_detected is None:
+            wake_detected = self.wake_word in text_lower
 
         # Check for exact match or substring
-        if self.wake_word in text_lower:
+        if wake_detected:
             logger.info("Wake word detected!")
             self.is_awake = True
-            self.last_wake_time = time.time()
+            self.last_wake_ns = time.monotonic_ns()
             return True
 
         # If already awake, check if still within timeout
         if self.is_awake:
-            if time.time() - self.last_wake_time < self.timeout:
+            if time.monotonic_ns() - self.last_wake_ns < self.timeout_ns:
                 return True
             else:
                 logger.info("Wake word timeout - going to sleep")
@@ -165,7 +355,7 @@ class WakeWordDetector:
     def reset(self):
         """Reset wake state"""
         self.is_awake = False
-        self.last_wake_time = 0
+        self.last_wake_ns = 0
 
 
 class VoiceAssistant:
@@ -177,12 +367,17 @@ class VoiceAssistant:
         # Error recovery
         self.restart_count = 0
         self.max_restarts = 3
+        self._canned_last_ns = dict.fromkeys(CANNED_REPLIES, 0)
 
         # Initialize components with error handling
         self._initialize_whisper()
+        self._initialize_vad()
         self._initialize_tts()
         self._initialize_wake_word()
 
+        # Jokes are loaded once; get_joke() rebuilds the list on every call
+        self._joke_pool = pyjokes.get_jokes()
+
         # Command dispatcher
         self.command_map = {
             "joke": self._skill_tell_joke,
@@ -193,36 +388,116 @@ class VoiceAssistant:
             "goodbye": self._skill_exit,
             "sleep": self._skill_sleep,
         }
+        self._cmd_automaton = self._build_command_automaton()
 
-        # Audio stream
-        self.audio_q = queue.Queue()
+        # Audio stream: the callback writes straight into a preallocated ring,
+        # _write_idx/_read_idx count total samples written/consumed
         self.keep_running = True
         self.sample_rate = 16000
+        self.chunk_size_samples = VAD_HOP_SAMPLES
+        self._ring = np.empty(self.sample_rate * 6, dtype=np.float32)
+        self._write_idx = 0
+        self._read_idx = 0
+        self._data_ready = threading.Event()
+        self._chunk = np.empty(self.chunk_size_samples, dtype=np.float32)
+
+        # Utterance buffer filled between VAD flushes
+        self._speech = np.empty(self.sample_rate * VAD_MAX_UTTERANCE_SECONDS, dtype=np.float32)
+        self._speech_len = 0
+        self._pad_samples = self.sample_rate * VAD_SPEECH_PAD_MS // 1000
+        self._silence_samples = self.sample_rate * VAD_TRAILING_SILENCE_MS // 1000
+        self._min_speech_samples = self.sample_rate * self.vad_options.min_speech_duration_ms // 1000
+
+        # Streaming VAD state: only each new hop is scored, speech bounds are running indexes
+        self._vad_context = np.zeros(VAD_FRAME_SAMPLES, dtype=np.float32)  # last frame of the previous hop
+        self._speech_start = None  # buffer index where the current utterance's speech began
+        self._speech_end = 0  # buffer index just past its last voiced frame
 
         logger.info("Voice Assistant initialized successfully")
 
     def _initialize_whisper(self):
         """Initialize Whisper with error handling"""
         try:
-            if not os.path.isdir(WHISPER_MODEL_DIR) or not os.path.exists(
-                    os.path.join(WHISPER_MODEL_DIR, "model.bin")
-            ):
-                raise FileNotFoundError(
-                    f"Local Whisper model files not found at '{WHISPER_MODEL_DIR}'"
-                )
+            if WHISPER_BACKEND == "whispercpp":
+                logger.info(f"Loading whisper.cpp model from: {WHISPERCPP_MODEL_PATH}")
+                self.model = WhisperCppBackend(WHISPERCPP_MODEL_PATH)
+                logger.info("whisper.cpp model loaded successfully")
+            else:
+                self._load_faster_whisper()
 
-            logger.info(f"Loading Whisper model from: {WHISPER_MODEL_DIR}")
-            self.model = WhisperModel(
-                WHISPER_MODEL_DIR,
-                device="cpu",
-                compute_type="int8"
-            )
-            logger.info("Whisper model loaded successfully")
+            self._bind_transcribe()
+            self._warmup_whisper()
 
         except Exception as e:
             logger.critical(f"Failed to initialize Whisper: {e}", exc_info=True)
             raise
 
+    def _load_faster_whisper(self):
+        """Load the faster-whisper model, trying compute types in order of preference"""
+        if not os.path.isdir(WHISPER_MODEL_DIR) or not os.path.exists(
+                os.path.join(WHISPER_MODEL_DIR, "model.bin")
+        ):
+            raise FileNotFoundError(
+                f"Local Whisper model files not found at '{WHISPER_MODEL_DIR}'"
+            )
+
+        logger.info(f"Loading Whisper model from: {WHISPER_MODEL_DIR}")
+        self.model = None
+        for compute_type in WHISPER_COMPUTE_TYPES:
+            try:
+                self.model = WhisperModel(
+                    WHISPER_MODEL_DIR,
+                    device="cpu",
+                    compute_type=compute_type
+                )
+                break
+            except ValueError as e:
+                logger.warning(f"Compute type '{compute_type}' unavailable: {e}")
+
+        if self.model is None:
+            raise RuntimeError(f"No usable compute type among {WHISPER_COMPUTE_TYPES}")
+        logger.info(f"Whisper model loaded successfully ({compute_type})")
+
+    def _bind_transcribe(self):
+        """Bind the constant transcription options once, per beam size"""
+        transcribe = functools.partial(
+            self.model.transcribe,
+            language="en",
+            temperature=0.0,  # Deterministic output
+            compression_ratio_threshold=2.4,
+            log_prob_threshold=-1.0,
+            no_speech_threshold=0.6,  # Higher = more aggressive filtering
+            condition_on_previous_text=False,
+            without_timestamps=True,  # Segment timestamps are never used
+        )
+        # VAD already ran upstream in _segment_speech, so no vad_filter here
+        self._transcribe = {
+            1: functools.partial(transcribe, beam_size=1, best_of=1),  # greedy wake-word pass
+            5: functools.partial(transcribe, beam_size=5, best_of=5),  # command pass
+        }
+
+    def _warmup_whisper(self):
+        """Run one dummy transcription so kernel selection happens before the first command"""
+        start = time.time()
+        segments, _ = self.model.transcribe(np.zeros(16000, dtype=np.float32), language="en", beam_size=1)
+        list(segments)  # faster-whisper decodes lazily
+        logger.info(f"Whisper warmed up in {time.time() - start:.2f}s")
+
+    def _initialize_vad(self):
+        """Configure the upstream Silero VAD used to segment utterances"""
+        self.vad_options = VadOptions(
+            threshold=0.5,  # Higher = more aggressive filtering (0.0-1.0)
+            min_speech_duration_ms=250,  # Minimum speech duration
+            min_silence_duration_ms=VAD_TRAILING_SILENCE_MS,  # Minimum silence to split
+            speech_pad_ms=0,  # Padding is applied when the utterance is flushed
+        )
+        self._vad_threshold = self.vad_options.threshold
+        self._vad_neg_threshold = max(self.vad_options.threshold - 0.15, 0.01)  # same hysteresis as faster-whisper
+
+        # Loads the Silero ONNX session now rather than on the first audio hop
+        self.vad_model = get_vad_model()
+        self.vad_model(np.zeros((1, VAD_FRAME_SAMPLES + VAD_HOP_SAMPLES), dtype=np.float32))
+
     def _initialize_tts(self):
         """Initialize TTS with error handling"""
         try:
@@ -231,10 +506,19 @@ class VoiceAssistant:
                 "en_GB-southern_english_female-low.onnx"
             )
             self.tts = PiperTTS(model_path)
+            self.tts.warmup()
+            self._canned_audio = {name: self.tts.render(text) for name, text in CANNED_REPLIES.items()}
         except Exception as e:
             logger.critical(f"Failed to initialize TTS: {e}", exc_info=True)
             raise
 
+    def _play_canned(self, name: str):
+        """Play a pre-rendered reply unless the same one played within the rate-limit window"""
+        now = time.monotonic_ns()
+        if now - self._canned_last_ns[name] >= CANNED_REPLY_INTERVAL_NS:
+            self._canned_last_ns[name] = now
+            self.tts.play(self._canned_audio[name])
+
     def _initialize_wake_word(self):
         """Initialize wake word detector"""
         self.wake_word_detector = WakeWordDetector(WAKE_WORD)
@@ -242,24 +526,23 @@ class VoiceAssistant:
     # --- Skill Methods ---
     def _skill_tell_joke(self):
         """Tell a programming joke"""
-        try:
-            joke = pyjokes.get_joke()
-            logger.info(f"Telling joke: {joke}")
-            self.tts.speak(joke)
-        except Exception as e:
-            logger.error(f"Error telling joke: {e}", exc_info=True)
-            self.tts.speak("Sorry, I couldn't think of a joke right now.")
+        joke = random.choice(self._joke_pool)
+        logger.info(f"Telling joke: {joke}")
+        self.tts.speak(joke)
 
     def _skill_tell_time(self):
         """Tell current time and date"""
-        try:
-            now = datetime.datetime.now()
-            time_str = now.strftime("It is %I:%M %p, on %A, %B %d.")
-            logger.info(f"Telling time: {time_str}")
-            self.tts.speak(time_str)
-        except Exception as e:
-            logger.error(f"Error telling time: {e}", exc_info=True)
-            self.tts.speak("Sorry, I couldn't get the current time.")
+        now = datetime.datetime.now()
+        time_str = TIME_TEMPLATE.format(
+            hour=now.hour % 12 or 12,
+            minute=now.minute,
+            ampm="AM" if now.hour < 12 else "PM",
+            weekday=DAY_NAMES[now.weekday()],
+            month=MONTH_NAMES[now.month],
+            day=now.day,
+        )
+        logger.info(f"Telling time: {time_str}")
+        self.tts.speak(time_str)
 
     def _skill_sleep(self):
         """Put assistant to sleep (deactivate wake word)"""
@@ -278,85 +561,208 @@ class VoiceAssistant:
     def callback(self, indata, frames, time_info, status):
         """Audio input callback"""
         if status:
-            logger.warning(f"Audio callback status: {status}")
-        self.audio_q.put(indata.copy())
+            logger.warning("Audio callback status: %s", status)
+
+        # Copy into the ring in at most two slices (wrap-around)
+        size = len(self._ring)
+        pos = self._write_idx % size
+        first = min(frames, size - pos)
+        np.copyto(self._ring[pos:pos + first], indata[:first, 0])
+        if frames > first:
+            np.copyto(self._ring[:frames - first], indata[first:frames, 0])
+        self._write_idx += frames
+        self._data_ready.set()
+
+    def _read_chunk(self) -> Optional[np.ndarray]:
+        """Copy the next full chunk out of the ring, or return None if not enough audio yet"""
+        write_idx = self._write_idx
+        filled = write_idx - self._read_idx
+        if filled < self.chunk_size_samples:
+            return None
+
+        size = len(self._ring)
+        if filled > size:
+            # Consumer fell behind and the callback overwrote unread audio; skip to the latest chunk
+            logger.warning("Audio ring overrun, skipping to latest audio")
+            self._read_idx = write_idx - self.chunk_size_samples
+
+        pos = self._read_idx % size
+        first = min(self.chunk_size_samples, size - pos)
+        self._chunk[:first] = self._ring[pos:pos + first]
+        if first < self.chunk_size_samples:
+            self._chunk[first:] = self._ring[:self.chunk_size_samples - first]
+        self._read_idx += self.chunk_size_samples
+        return self._chunk
+
+    def _segment_speech(self, hop: np.ndarray) -> Optional[np.ndarray]:
+        """
+        Append a hop of audio to the utterance buffer and run the VAD over the new frames.
+
+        Only the hop itself is scored (plus one frame of left context), so the
+        cost per hop stays constant however long the utterance gets.
+
+        Returns:
+            The padded utterance once it is followed by enough silence, else None
+        """
+        n = len(hop)
+        if self._speech_len + n > len(self._speech):
+            self._reset_segmenter()  # should not happen, flushes happen before the buffer fills
+        offset = self._speech_len
+        self._speech[offset:offset + n] = hop
+        self._speech_len += n
+
+        # One ONNX call per hop; the context frame's own score is dropped
+        probs = self.vad_model(np.concatenate((self._vad_context, hop)).reshape(1, -1))[0, 1:]
+        self._vad_context[:] = hop[-VAD_FRAME_SAMPLES:]
+
+        for i, prob in enumerate(probs):
+            if self._speech_start is None:
+                if prob >= self._vad_threshold:
+                    self._speech_start = offset + i * VAD_FRAME_SAMPLES
+                    self._speech_end = self._speech_start + VAD_FRAME_SAMPLES
+            elif prob >= self._vad_neg_threshold:
+                self._speech_end = offset + (i + 1) * VAD_FRAME_SAMPLES
+
+        if self._speech_start is None:
+            # Silence: keep only a short pre-roll so speech onsets aren't clipped
+            keep = min(self._pad_samples, self._speech_len)
+            self._speech[:keep] = self._speech[self._speech_len - keep:self._speech_len]
+            self._speech_len = keep
+            return None
+
+        full = self._speech_len + VAD_HOP_SAMPLES > len(self._speech)
+        if self._speech_len - self._speech_end < self._silence_samples and not full:
+            return None  # still talking
+
+        start = max(0, self._speech_start - self._pad_samples)
+        stop = min(self._speech_len, self._speech_end + self._pad_samples)
+        voiced = self._speech_end - self._speech_start
+        self._reset_segmenter()
+        if voiced < self._min_speech_samples:
+            return None  # a click or a cough, not an utterance
+        return self._speech[start:stop]
+
+    def _reset_segmenter(self):
+        """Drop the buffered utterance and the streaming VAD state"""
+        self._speech_len = 0
+        self._speech_start = None
+        self._speech_end = 0
+        self._vad_context[:] = 0
+
+    def _build_command_automaton(self):
+        """Build one Aho-Corasick automaton over the wake word and all skill triggers"""
+        automaton = ahocorasick.Automaton()
+        for trigger, skill_func in self.command_map.items():
+            automaton.add_word(trigger, (trigger, skill_func))
+        wake_word = self.wake_word_detector.wake_word
+        automaton.add_word(wake_word, (wake_word, None))
+        automaton.make_automaton()
+        return automaton
+
+    def _scan_command(self, text: str):
+        """
+        Scan text once for wake word occurrences and skill triggers.
+
+        Returns:
+            (wake_spans, trigger, skill_func) where wake_spans are non-overlapping
+            (start, end) spans of the wake word and trigger is the first skill
+            trigger outside them, or (wake_spans, None, None) if there is none.
+        """
+        wake_spans = []
+        trigger_hits = []
+        for end, (key, skill_func) in self._cmd_automaton.iter(text):
+            start = end - len(key) + 1
+            if skill_func is None:
+                if not wake_spans or start >= wake_spans[-1][1]:
+                    wake_spans.append((start, end + 1))
+            else:
+                trigger_hits.append((start, end + 1, key, skill_func))
+
+        for start, end, key, skill_func in trigger_hits:
+            if not any(start < w_end and end > w_start for w_start, w_end in wake_spans):
+                return wake_spans, key, skill_func
+        return wake_spans, None, None
 
     def handle_command(self, text: str):
         """Process recognized command"""
-        text = text.lower().strip()
-        if not text:
+        text_lower = text.lower().strip()
+        if not text_lower:
             return
 
-        logger.info(f"Recognized: '{text}'")
+        logger.info("Recognized: '%s'", text_lower)
 
-        # Check wake word first
-        if not self.wake_word_detector.check(text):
-            logger.debug("Wake word not detected, ignoring command")
+        # Check wake word first, using a single scan for wake word and triggers
+        wake_spans, trigger, skill_func = self._scan_command(text_lower)
+        if not self.wake_word_detector.check(text_lower, wake_detected=bool(wake_spans)):
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Wake word not detected, ignoring command")
             return
 
-        # Remove wake word from text if present
-        command_text = text.replace(self.wake_word, "").strip()
-        if not command_text and text != self.wake_word:
-            return
+        # Remove wake word from text using the spans found by the scan
+        pieces = []
+        prev_end = 0
+        for start, end in wake_spans:
+            pieces.append(text_lower[prev_end:start])
+            prev_end = end
+        pieces.append(text_lower[prev_end:])
+        command_text = "".join(pieces).strip()
 
         # If only wake word was said, acknowledge
-        if not command_text or command_text == self.wake_word:
-            self.tts.speak("Yes? I'm listening.")
+        if not command_text:
+            if text_lower == self.wake_word_detector.wake_word:
+                self.tts.speak("Yes? I'm listening.")
             return
 
-        # Check for matching command
-        for trigger, skill_func in self.command_map.items():
-            if trigger in command_text:
-                logger.info(f"Executing skill: {trigger}")
-                try:
-                    skill_func()
-                except Exception as e:
-                    logger.error(f"Error executing skill '{trigger}': {e}", exc_info=True)
-                    self.tts.speak("Sorry, something went wrong.")
-                return
+        # Run the matching command; skills don't catch their own errors
+        if skill_func is not None:
+            logger.info("Executing skill: %s", trigger)
+            try:
+                skill_func()
+            except Exception as e:
+                logger.error("Error executing skill '%s': %s", trigger, e, exc_info=True)
+                self._play_canned("error")
+            return
 
         # No matching command
-        logger.debug(f"No matching command for: {command_text}")
-        self.tts.speak(f"I heard you say {command_text}, but I don't know what to do with that yet.")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("No matching command for: %s", command_text)
+        self._play_canned("miss")
 
-    def transcribe_audio(self, audio_buffer: np.ndarray) -> list:
+    def transcribe_audio(self, audio_buffer: np.ndarray, beam_size: int = 5) -> list:
         """
-        Transcribe audio with improved VAD settings.
+        Transcribe a VAD-segmented utterance.
 
         Args:
             audio_buffer: Audio data to transcribe
+            beam_size: 1 for the greedy pass, 5 for the accurate command pass
 
         Returns:
             List of transcribed segments
         """
         try:
-            # Improved VAD parameters for better noise rejection
-            segments, info = self.model.transcribe(
-                audio_buffer,
-                vad_filter=True,
-                vad_parameters={
-                    "threshold": 0.5,  # Higher = more aggressive filtering (0.0-1.0)
-                    "min_speech_duration_ms": 250,  # Minimum speech duration
-                    "max_speech_duration_s": 30,  # Maximum speech duration
-                    "min_silence_duration_ms": 500,  # Minimum silence to split
-                    "speech_pad_ms": 400,  # Padding around speech
-                },
-                language="en",
-                beam_size=5,  # Higher = more accurate but slower
-                best_of=5,
-                temperature=0.0,  # Deterministic output
-                compression_ratio_threshold=2.4,
-                log_prob_threshold=-1.0,
-                no_speech_threshold=0.6,  # Higher = more aggressive filtering
-                condition_on_previous_text=False,
-            )
-
-            return list(segments)
+            return list(self._transcribe[beam_size](audio_buffer)[0])
 
         except Exception as e:
-            logger.error(f"Transcription error: {e}", exc_info=True)
+            logger.error("Transcription error: %s", e, exc_info=logger.isEnabledFor(logging.DEBUG))
             return []
 
+    def transcribe_command(self, audio_buffer: np.ndarray) -> list:
+        """
+        Two-stage transcription: while asleep, a greedy pass checks for the wake
+        word and the beam-search pass only runs on utterances that contain it.
+
+        Returns:
+            List of transcribed segments
+        """
+        if not self.wake_word_detector.is_awake:
+            segments = self.transcribe_audio(audio_buffer, beam_size=1)
+            text = " ".join(segment.text.strip() for segment in segments).lower()
+            wake_spans, _, _ = self._scan_command(text)
+            if not wake_spans:
+                return segments  # handle_command ignores these while asleep
+
+        return self.transcribe_audio(audio_buffer, beam_size=5)
+
     def listen(self):
         """Main listening loop with error recovery"""
         try:
@@ -369,36 +775,42 @@ class VoiceAssistant:
 
             with sd.InputStream(
                     samplerate=self.sample_rate,
-                    blocksize=4096,
+                    blocksize=1024,
+                    latency="low",
                     dtype="float32",
                     channels=1,
                     callback=self.callback,
             ):
-                audio_buffer = np.array([], dtype=np.float32)
-                CHUNK_SIZE_SAMPLES = self.sample_rate * 3  # 3-second chunks
-
                 while self.keep_running:
                     try:
-                        # Get audio data with timeout
-                        data = self.audio_q.get(timeout=0.5)
-                        audio_buffer = np.concatenate((audio_buffer, data.flatten()))
-
-                        # Process when buffer is large enough
-                        if len(audio_buffer) >= CHUNK_SIZE_SAMPLES:
-                            # Only transcribe if not currently speaking
-                            if not self.tts.is_speaking.is_set():
-                                segments = self.transcribe_audio(audio_buffer)
-
-                                for segment in segments:
-                                    text = segment.text.strip()
-                                    if text:
-                                        self.handle_command(text)
-
-                            # Clear buffer
-                            audio_buffer = np.array([], dtype=np.float32)
-
-                    except queue.Empty:
-                        continue
+                        # Wait for the callback to deliver audio
+                        if not self._data_ready.wait(timeout=0.5):
+                            continue
+                        self._data_ready.clear()
+
+                        # Feed every available hop to the VAD
+                        while (hop := self._read_chunk()) is not None:
+                            # Ignore audio (our own voice) while TTS is speaking
+                            if self.tts.is_speaking.is_set():
+                                self._reset_segmenter()
+                                continue
+
+                            audio_buffer = self._segment_speech(hop)
+                            if audio_buffer is None:
+                                continue
+
+                            # Cheap energy gate so near-silent VAD hits never reach Whisper
+                            energy = float(np.dot(audio_buffer, audio_buffer)) / len(audio_buffer)
+                            if energy < MIN_SPEECH_ENERGY:
+                                if logger.isEnabledFor(logging.DEBUG):
+                                    logger.debug("Utterance energy %.2e below threshold, skipping", energy)
+                                continue
+
+                            segments = self.transcribe_command(audio_buffer)
+
+                            # handle_command normalizes and skips empty text itself
+                            for segment in segments:
+                                self.handle_command(segment.text)
 
                     except Exception as e:
                         logger.error(f"Error in listen loop: {e}", exc_info=True)
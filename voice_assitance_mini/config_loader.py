@@ -3,12 +3,100 @@ Configuration loader for Voice Assistant
 Handles loading and validation of configuration files
 """
 import os
+import copy
+import json
 import yaml
 import logging
-from typing import Dict, Any
+from collections import OrderedDict
+from typing import Dict, Any, Optional
 
 logger = logging.getLogger(__name__)
 
+# Use the libyaml C parser when PyYAML was built with it
+SafeLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+# Parsed configs keyed by (path, mtime_ns, size), least recently used first
+_CACHE_MAX_ENTRIES = 100
+_parse_cache: 'OrderedDict[tuple, Any]' = OrderedDict()
+
+
+def _sidecar_path(config_file: str) -> str:
+    """JSON cache stored next to the YAML file"""
+    return config_file + '.json'
+
+
+def _read_sidecar(config_file: str, st: os.stat_result) -> Optional[Any]:
+    """Return the cached parse if the sidecar matches the YAML's mtime and size"""
+    try:
+        with open(_sidecar_path(config_file), 'r') as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(cached, dict):
+        return None  # not a sidecar we wrote, re-parse the YAML
+    if cached.get('mtime_ns') != st.st_mtime_ns or cached.get('size') != st.st_size:
+        return None
+    return cached.get('config')
+
+
+def _write_sidecar(config_file: str, st: os.stat_result, data: Any):
+    """Write the JSON cache atomically; skipped if the config isn't JSON round-trippable"""
+    try:
+        payload = json.dumps({'mtime_ns': st.st_mtime_ns, 'size': st.st_size, 'config': data})
+        if json.loads(payload)['config'] != data:
+            return  # e.g. non-string keys, which JSON would silently convert
+
+        tmp_path = _sidecar_path(config_file) + '.tmp'
+        with open(tmp_path, 'w') as f:
+            f.write(payload)
+        os.replace(tmp_path, _sidecar_path(config_file))
+    except (OSError, TypeError, ValueError) as e:
+        logger.debug(f"Could not write config cache for {config_file}: {e}")
+
+
+def load_yaml_cached(config_file: str) -> Any:
+    """
+    Parse a YAML file, reusing earlier results while the file is unchanged.
+
+    Checks the in-process LRU first, then the JSON sidecar, and only parses
+    the YAML when both are stale.
+
+    Returns:
+        A private copy of the parsed data
+    """
+    st = os.stat(config_file)
+    key = (os.path.abspath(config_file), st.st_mtime_ns, st.st_size)
+
+    data = _parse_cache.get(key)
+    if data is not None:
+        _parse_cache.move_to_end(key)
+        return copy.deepcopy(data)
+
+    data = _read_sidecar(config_file, st)
+    if data is None:
+        with open(config_file, 'r') as f:
+            data = yaml.load(f, Loader=SafeLoader)
+        _write_sidecar(config_file, st, data)
+
+    _parse_cache[key] = data
+    if len(_parse_cache) > _CACHE_MAX_ENTRIES:
+        _parse_cache.popitem(last=False)
+    return copy.deepcopy(data)
+
+
+def drop_cached(config_file: str):
+    """Forget cached parses of config_file after it is rewritten; don't rely on mtime granularity"""
+    path = os.path.abspath(config_file)
+    for key in [key for key in _parse_cache if key[0] == path]:
+        del _parse_cache[key]
+    try:
+        os.remove(_sidecar_path(config_file))
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.debug(f"Could not remove config cache for {config_file}: {e}")
+
 
 class Config:
     """Configuration manager with defaults"""
@@ -77,7 +165,7 @@ class Config:
             config_file: Path to YAML config file
         """
         self.config_file = config_file
-        self.config = self.DEFAULT_CONFIG.copy()
+        self.config = copy.deepcopy(self.DEFAULT_CONFIG)
 
         if os.path.exists(config_file):
             self.load(config_file)
@@ -88,8 +176,7 @@ class Config:
     def load(self, config_file: str):
         """Load configuration from YAML file"""
         try:
-            with open(config_file, 'r') as f:
-                user_config = yaml.safe_load(f)
+            user_config = load_yaml_cached(config_file)
 
             if user_config:
                 self._merge_configs(self.config, user_config)
@@ -106,6 +193,7 @@ class Config:
         try:
             with open(config_file, 'w') as f:
                 yaml.dump(self.config, f, default_flow_style=False, sort_keys=False)
+            drop_cached(config_file)
             logger.info(f"Configuration saved to {config_file}")
         except Exception as e:
             logger.error(f"Failed to save config to {config_file}: {e}")
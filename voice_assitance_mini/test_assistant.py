@@ -6,8 +6,8 @@ import os
 import sys
 import time
 import logging
+import importlib.util
 import numpy as np
-from pathlib import Path
 
 # Configure logging for tests
 logging.basicConfig(
@@ -34,17 +34,19 @@ def test_imports():
         'faster_whisper': 'faster-whisper',
         'piper': 'piper-tts',
         'yaml': 'pyyaml',
-        'pyjokes': 'pyjokes'
+        'pyjokes': 'pyjokes',
+        'ahocorasick': 'pyahocorasick'
     }
 
-    all_good = True
+    # find_spec only locates each package; nothing heavy gets imported here
+    missing = {m for m in required_packages if importlib.util.find_spec(m) is None}
     for module, package in required_packages.items():
-        try:
-            __import__(module)
-            print(f"✓ {module:20s} - OK")
-        except ImportError as e:
+        if module in missing:
             print(f"✗ {module:20s} - MISSING (install: pip install {package})")
-            all_good = False
+        else:
+            print(f"✓ {module:20s} - OK")
+
+    all_good = not missing
 
     if all_good:
         print("\n✓ All packages installed correctly")
@@ -68,14 +70,25 @@ def test_file_structure():
         'whisper_model/config.json',
     ]
 
+    # One scandir pass per directory; DirEntry caches the stat result
+    entries = {}
+    for directory in {os.path.dirname(f) or '.' for f in required_files}:
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    entries[os.path.normpath(entry.path)] = entry
+        except OSError:
+            pass  # missing directory, its files are reported below
+
     all_good = True
     for filepath in required_files:
-        path = Path(filepath)
-        if path.exists():
-            size = path.stat().st_size if path.is_file() else "DIR"
-            print(f"✓ {str(path):40s} - EXISTS ({size})")
+        path = os.path.normpath(filepath)
+        entry = entries.get(path)
+        if entry is not None:
+            size = entry.stat().st_size if entry.is_file() else "DIR"
+            print(f"✓ {path:40s} - EXISTS ({size})")
         else:
-            print(f"✗ {str(path):40s} - MISSING")
+            print(f"✗ {path:40s} - MISSING")
             all_good = False
 
     if all_good:
@@ -304,10 +317,11 @@ def test_microphone_recording():
 
         print("✓ Recording complete")
 
-        # Analyze audio
-        audio_flat = audio.flatten()
-        rms = np.sqrt(np.mean(audio_flat ** 2))
-        peak = np.max(np.abs(audio_flat))
+        # Analyze audio on a view of the mono channel; the recording is kept
+        # intact for playback, so no in-place squaring
+        audio_flat = audio[:, 0]
+        rms = np.sqrt(np.dot(audio_flat, audio_flat) / len(audio_flat))
+        peak = max(audio_flat.max(), -audio_flat.min())
 
         print(f"\nAudio Analysis:")
         print(f"  RMS level: {rms:.6f}")